@@ -0,0 +1,123 @@
+"""
+Benchmark the algorithms module against their NetworkX equivalents on large sparse random graphs
+
+Usage:
+    python benchmarks/bench_algorithms.py [--nodes N] [--degree D] [--coloring-nodes N] [--seed S]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "graph_visualiser"))
+
+from algorithms import articulation_points, dsatur_coloring, kruskal, prim, topological_sort  # noqa: E402
+from graph import GraphNetX  # noqa: E402
+
+
+def random_edges(nodes, degree, acyclic=False):
+    """
+    Draw random weighted edges
+
+    params:
+        nodes: the number of nodes
+        degree: the average number of edges per node
+        acyclic: True to only draw edges from a smaller to a larger node index
+    returns:
+        a list of (node1, node2, weight) tuples
+    """
+    edges = []
+    for _ in range(nodes * degree):
+        u, v = random.randrange(nodes), random.randrange(nodes)
+        if u == v:
+            continue
+        if acyclic and u > v:
+            u, v = v, u
+        edges.append((u, v, float(random.randint(1, 1000))))
+    return edges
+
+
+def build(nodes, edges, directed=False):
+    """
+    Build the same graph as a GraphNetX and as a NetworkX graph
+
+    returns:
+        a (GraphNetX, networkx graph) tuple
+    """
+    graph = GraphNetX(directed=directed, weighted=True)
+    graph.add_nodes(range(nodes))
+    graph.add_edges(edges)
+
+    reference = nx.DiGraph() if directed else nx.Graph()
+    reference.add_nodes_from(range(nodes))
+    reference.add_edges_from((u, v, {"weight": graph.weight(u, v)}) for (u, v, _) in graph.iter_edges())
+    return graph, reference
+
+
+def timed(function):
+    """
+    Run a function once
+
+    returns:
+        a (seconds, result) tuple
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def report(name, ours, theirs):
+    """ Print one line of the comparison table """
+    print(f"{name:<22}{ours:>10.3f}s{theirs:>10.3f}s{theirs / ours:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000, help="number of nodes")
+    parser.add_argument("--degree", type=int, default=3, help="average number of edges per node")
+    parser.add_argument("--coloring-nodes", type=int, default=2_000,
+                        help="number of nodes of the coloring graph, NetworkX DSatur is quadratic")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    print(f"{args.nodes} nodes, {args.degree} edges per node")
+    print(f"{'algorithm':<22}{'ours':>11}{'networkx':>11}{'speedup':>10}")
+
+    graph, reference = build(args.nodes, random_edges(args.nodes, args.degree))
+
+    ours, (_, weight) = timed(lambda: kruskal(graph))
+    theirs, tree = timed(lambda: nx.minimum_spanning_tree(reference, algorithm="kruskal"))
+    assert abs(weight - tree.size(weight="weight")) < 1e-6
+    report("kruskal", ours, theirs)
+
+    ours, (_, weight) = timed(lambda: prim(graph))
+    theirs, tree = timed(lambda: nx.minimum_spanning_tree(reference, algorithm="prim"))
+    assert abs(weight - tree.size(weight="weight")) < 1e-6
+    report("prim", ours, theirs)
+
+    ours, (_, points, bridges) = timed(lambda: articulation_points(graph))
+    theirs, expected = timed(lambda: (set(nx.articulation_points(reference)), list(nx.bridges(reference))))
+    assert points == expected[0] and len(bridges) == len(expected[1])
+    report("articulation/bridges", ours, theirs)
+
+    dag, dag_reference = build(args.nodes, random_edges(args.nodes, args.degree, acyclic=True), directed=True)
+    ours, (_, order) = timed(lambda: topological_sort(dag))
+    theirs, _ = timed(lambda: list(nx.topological_sort(dag_reference)))
+    position = {node: index for index, node in enumerate(order)}
+    assert all(position[u] < position[v] for (u, v) in dag_reference.edges())
+    report("topological sort", ours, theirs)
+
+    small, small_reference = build(args.coloring_nodes, random_edges(args.coloring_nodes, args.degree))
+    ours, (_, colors) = timed(lambda: dsatur_coloring(small))
+    theirs, expected = timed(lambda: nx.greedy_color(small_reference, strategy="DSATUR"))
+    assert all(colors[u] != colors[v] for (u, v) in small_reference.edges())
+    report(f"dsatur ({args.coloring_nodes} nodes)", ours, theirs)
+    print(f"colors: ours {max(colors.values()) + 1}, networkx {max(expected.values()) + 1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Graph algorithms working on a GraphNetX
+
+Every algorithm returns a list of steps for the visualization, each step being a (node, parent) tuple:
+the node is visited, reached through the edge between parent and node, or from nowhere if parent is None.
+Edges implied by cliques are expanded once per algorithm, they weigh DEFAULT_WEIGHT
+"""
+from collections import deque
+from itertools import chain, count
+
+from graph import DEFAULT_WEIGHT
+from priority_queue import IndexedHeap
+from union_find import UnionFind
+
+
+def traversal_steps(order, parents):
+    """
+    Turn a traversal order and its parents into steps
+
+    params:
+        order: list of node indices in visiting order
+        parents: dictionary mapping each node to its parent in the traversal
+    returns:
+        the list of (node, parent) steps
+    """
+    return [(node, parents.get(node)) for node in order]
+
+
+def kruskal(graph):
+    """
+    Compute a minimum spanning forest with Kruskal's algorithm
+
+    Edge directions are ignored
+
+    Algorithm:
+        - Sort the edges by increasing weight, each clique contributing the edges of a star
+        spanning its members, which is enough since all its implied edges weigh the same
+        - Keep each edge joining two different trees of a union-find forest
+
+    params:
+        graph: the GraphNetX
+    returns:
+        steps: one step per kept edge
+        weight: the total weight of the forest
+    """
+    edges = [(graph.edge_weight(edge_id), u, v) for (u, v, edge_id) in graph.iter_edges()]
+    for members in graph.cliques.values():
+        members = iter(members)
+        center = next(members)
+        edges.extend((DEFAULT_WEIGHT, center, member) for member in members)
+    edges.sort(key=lambda edge: edge[0])
+
+    forest = UnionFind(graph.get_nodes())
+    steps = []
+    total_weight = 0.0
+    for weight, u, v in edges:
+        if forest.union(u, v) is not None:
+            steps.append((v, u))
+            total_weight += weight
+
+    return steps, total_weight
+
+
+def prim(graph, start_node=None, arity=4):
+    """
+    Compute a minimum spanning forest with Prim's algorithm
+
+    Edge directions are ignored
+
+    Algorithm:
+        - Grow a tree from the start node, keeping every node adjacent to the tree in an indexed heap
+        with the weight of its lightest edge towards the tree as priority
+        - Repeatedly add the node of smallest priority and lower the priority of its neighbors in place
+        - Start a new tree from the next unreached node until every node is reached
+
+    params:
+        graph: the GraphNetX
+        start_node: the index of the node of the first tree, or None to start from any node
+        arity: the arity of the heap
+    returns:
+        steps: one step per node, in the order the nodes join the forest
+        weight: the total weight of the forest
+    """
+    roots = graph.get_nodes()
+    if start_node is not None and graph.has_node(start_node):
+        roots.insert(0, start_node)
+
+    reached = set()
+    parents = {}
+    pending = {}
+    heap = IndexedHeap(arity)
+    steps = []
+    total_weight = 0.0
+
+    for root in roots:
+        if root in reached:
+            continue
+        parents[root] = None
+        heap.push(root, 0.0)
+
+        while heap:
+            node, weight = heap.pop()
+            reached.add(node)
+            steps.append((node, parents[node]))
+            total_weight += weight
+
+            for neighbor, edge_weight in _undirected_neighbors(graph, node, pending):
+                if neighbor not in reached and (neighbor not in heap or edge_weight < heap.priority(neighbor)):
+                    parents[neighbor] = node
+                    heap.push(neighbor, edge_weight)
+
+    return steps, total_weight
+
+
+def topological_sort(graph):
+    """
+    Order the nodes of a directed acyclic graph so that every edge goes forward, with Kahn's algorithm
+
+    params:
+        graph: the GraphNetX
+    returns:
+        steps: one step per node, the parent being the node whose removal freed it
+        order: the list of node indices
+    raises:
+        ValueError: if the graph is undirected or has a cycle
+    """
+    if not graph.directed:
+        raise ValueError("A topological order needs a directed graph")
+
+    if graph.cliques:
+        raise ValueError("The graph has a cycle")
+
+    in_degrees = {node: len(graph.graph.pred[node]) for node in graph.graph}
+    queue = deque(node for node, in_degree in in_degrees.items() if in_degree == 0)
+    freed_by = {}
+    steps = []
+
+    while queue:
+        node = queue.popleft()
+        steps.append((node, freed_by.get(node)))
+        for successor in graph.graph.successors(node):
+            in_degrees[successor] -= 1
+            if in_degrees[successor] == 0:
+                freed_by[successor] = node
+                queue.append(successor)
+
+    if len(steps) < len(in_degrees):
+        raise ValueError("The graph has a cycle")
+
+    return steps, [node for node, _ in steps]
+
+
+def articulation_points(graph):
+    """
+    Find the articulation points and the bridges with an iterative version of Tarjan's algorithm
+
+    Edge directions are ignored, parallel edges of an undirected multigraph are never bridges.
+    A clique of three members or more is biconnected: instead of expanding its edges, every member
+    gets a back edge to the first member discovered, which yields the same low-links
+
+    Algorithm:
+        - Run a depth-first search with an explicit stack, numbering the nodes in discovery order
+        - The low-link of a node is the smallest number reachable from its subtree with one back edge
+        - A non-root node is an articulation point if a child cannot reach above it (low-link >= its number),
+        the root is one if it has several children
+        - A tree edge is a bridge if the child cannot reach the parent or above (low-link > number of the parent)
+
+    params:
+        graph: the GraphNetX
+    returns:
+        steps: one step per node, in discovery order
+        points: the set of articulation points
+        bridges: the list of (parent, child) bridges
+    """
+    discovery = {}
+    low = {}
+    parents = {}
+    hubs = {}
+    pending = {}
+    steps = []
+    points = set()
+    bridges = []
+
+    def discover(node, parent):
+        discovery[node] = low[node] = len(discovery)
+        parents[node] = parent
+        steps.append((node, parent))
+
+        clique_id = graph.node_clique.get(node)
+        if clique_id is not None:
+            hub = hubs.setdefault(clique_id, node)
+            if hub != node and hub != parent:
+                low[node] = discovery[hub]
+        return node, _undirected_adjacent(graph, node, pending)
+
+    for root in graph.get_nodes():
+        if root in discovery:
+            continue
+        root_children = 0
+        stack = [discover(root, None)]
+
+        while stack:
+            node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if neighbor not in discovery:
+                    stack.append(discover(neighbor, node))
+                    break
+                if neighbor != parents[node] or _has_parallel_edges(graph, node, neighbor):
+                    low[node] = min(low[node], discovery[neighbor])
+            else:
+                stack.pop()
+                parent = parents[node]
+                if parent is None:
+                    continue
+                low[parent] = min(low[parent], low[node])
+                if low[node] > discovery[parent]:
+                    bridges.append((parent, node))
+                if parent == root:
+                    root_children += 1
+                elif low[node] >= discovery[parent]:
+                    points.add(parent)
+
+        if root_children > 1:
+            points.add(root)
+
+    return steps, points, bridges
+
+
+def dsatur_coloring(graph, arity=4):
+    """
+    Color the nodes so that adjacent nodes get different colors, with the DSatur heuristic
+
+    Edge directions are ignored. The edges implied by cliques are never expanded: the saturation of a member
+    counts the colors of its clique once, and every clique keeps its uncolored members in its own heap,
+    where they are ordered by the colors of their explicit neighbors only, since the clique part is shared
+
+    Algorithm:
+        - Keep the uncolored nodes in an indexed heap ordered by saturation (the number of distinct colors
+        among their neighbors), then by degree, largest first, a clique standing for its best member
+        - Repeatedly give the most saturated node the smallest color unused by its neighbors,
+        and raise the saturation of its uncolored neighbors in place
+
+    params:
+        graph: the GraphNetX
+        arity: the arity of the heaps
+    returns:
+        steps: one step per node, in coloring order
+        colors: a dictionary mapping each node to its color, colors being numbered from 0
+    """
+    nodes = graph.get_nodes()
+    explicit = {node: set(graph.explicit_neighbors(node)) for node in nodes}
+    degrees = {node: len(explicit[node]) + max(len(graph.clique_of(node)) - 1, 0) for node in nodes}
+    neighbor_colors = {node: set() for node in nodes}
+    outside_colors = {node: set() for node in nodes}
+
+    clique_colors = {clique_id: set() for clique_id in graph.cliques}
+    free_colors = {clique_id: [[], 0] for clique_id in graph.cliques}
+    holders = {clique_id: {} for clique_id in graph.cliques}
+    members = {clique_id: IndexedHeap(arity) for clique_id in graph.cliques}
+
+    heap = IndexedHeap(arity)
+
+    def refresh_clique(clique_id):
+        if members[clique_id]:
+            _, (outside, degree) = members[clique_id].peek()
+            heap.push(("clique", clique_id), (outside - len(clique_colors[clique_id]), degree))
+
+    def refresh(node):
+        priority = (-len(outside_colors[node]), -degrees[node])
+        clique_id = graph.node_clique.get(node)
+        if clique_id is None:
+            heap.push(("node", node), priority)
+        else:
+            members[clique_id].push(node, priority)
+            refresh_clique(clique_id)
+
+    for node in nodes:
+        refresh(node)
+
+    steps = []
+    colors = {}
+    while heap:
+        (kind, key), _ = heap.pop()
+        node = members[key].pop()[0] if kind == "clique" else key
+        clique_id = graph.node_clique.get(node)
+
+        gaps, top = free_colors[clique_id] if clique_id is not None else ((), 0)
+        color = next(color for color in chain(gaps, count(top)) if color not in neighbor_colors[node])
+        colors[node] = color
+        steps.append((node, None))
+
+        for neighbor in explicit[node]:
+            if neighbor in colors or color in neighbor_colors[neighbor]:
+                continue
+            neighbor_colors[neighbor].add(color)
+            neighbor_clique = graph.node_clique.get(neighbor)
+            if neighbor_clique is None or color not in clique_colors[neighbor_clique]:
+                outside_colors[neighbor].add(color)
+                if neighbor_clique is not None:
+                    holders[neighbor_clique].setdefault(color, set()).add(neighbor)
+                refresh(neighbor)
+
+        if clique_id is not None:
+            clique_colors[clique_id].add(color)
+            if color >= top:
+                gaps.extend(range(top, color))
+                free_colors[clique_id][1] = color + 1
+            else:
+                gaps.remove(color)
+            for holder in holders[clique_id].pop(color, ()):
+                if holder not in colors:
+                    outside_colors[holder].discard(color)
+                    members[clique_id].push(holder, (-len(outside_colors[holder]), -degrees[holder]))
+            refresh_clique(clique_id)
+
+    return steps, colors
+
+
+def _undirected_neighbors(graph, node, pending):
+    """ Yield (neighbor, weight) tuples for the edges of a node in both directions """
+    for neighbor in graph.graph.neighbors(node):
+        yield neighbor, graph.weight(node, neighbor)
+    if graph.directed:
+        for neighbor in graph.graph.predecessors(node):
+            yield neighbor, graph.weight(neighbor, node)
+    for member in graph.drain_clique(node, pending):
+        if member != node:
+            yield member, DEFAULT_WEIGHT
+
+
+def _undirected_adjacent(graph, node, pending):
+    """ Yield the neighbors of a node in both directions, each explicit neighbor once """
+    yield from graph.explicit_neighbors(node)
+    for member in graph.drain_clique(node, pending):
+        if member != node:
+            yield member
+
+
+def _has_parallel_edges(graph, node1, node2):
+    """ Check if two nodes of an undirected multigraph are linked by several edges """
+    return graph.multigraph and not graph.directed and graph.graph.number_of_edges(node1, node2) > 1
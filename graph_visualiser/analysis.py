@@ -0,0 +1,498 @@
+import heapq
+from collections import Counter, deque
+from itertools import chain
+
+from union_find import UnionFind
+
+
+class GraphAnalysis:
+    """
+    Analysis results kept up to date while the graph is edited
+
+    Maintains connected components, degree statistics and a BFS tree from a chosen root.
+    Directed graphs and multigraphs are analysed through their underlying simple undirected graph.
+    Insertions are applied immediately (union-find merge, distance relaxation), deletions only mark
+    the affected component or BFS subtree as dirty, and dirty regions are recomputed on the next query
+    """
+    def __init__(self, graph):
+        """
+        Initialize the analysis of a graph
+
+        params:
+            graph: the GraphNetX whose mutations are reported to this analysis
+        """
+        self.graph = graph
+
+        self.components_ = UnionFind()
+        self.component_members = {}
+        self.dirty_components = set()
+        self.removed_nodes = set()
+
+        self.degrees = {}
+        self.degree_histogram = Counter()
+        self.edge_count = 0
+
+        self.bfs_root = None
+        self.distances = {}
+        self.bfs_parents = {}
+        self.bfs_children = {}
+        self.dirty_subtrees = set()
+
+        self.reset(graph.get_nodes())
+
+    """ Mutation hooks """
+    def reset(self, nodes=()):
+        """
+        Recompute everything from scratch
+
+        params:
+            nodes: the nodes of the graph
+        """
+        self.components_ = UnionFind()
+        self.component_members = {}
+        self.dirty_components.clear()
+        self.removed_nodes.clear()
+
+        self.degrees = {}
+        self.degree_histogram = Counter()
+        self.edge_count = 0
+
+        for node in nodes:
+            self.add_node(node)
+
+        for (u, v) in self.graph.adjacent_pairs():
+            self._merge(u, v)
+            self._shift_degree(u, 1)
+            self._shift_degree(v, 1)
+            self.edge_count += 1
+
+        for members in self.graph.cliques.values():
+            self._link_clique(list(members))
+
+        self.set_bfs_root(self.bfs_root if self.graph.has_node(self.bfs_root) else None)
+
+    def add_node(self, node):
+        """
+        Register a new isolated node
+
+        params:
+            node: the index of the added node
+        """
+        if node in self.removed_nodes:
+            self._refresh_components()
+
+        if node not in self.degrees:
+            self.components_.add(node)
+            self.component_members[node] = {node}
+            self.degrees[node] = 0
+            self.degree_histogram[0] += 1
+
+    def add_edge(self, node1, node2):
+        """
+        Register a new edge
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        """
+        self.add_edges([(node1, node2)])
+
+    def add_edges(self, edges):
+        """
+        Register several new edges
+
+        The BFS tree is relaxed once from every new edge instead of once per edge
+
+        params:
+            edges: list of (node1, node2) tuples
+        """
+        for (u, v) in edges:
+            self._merge(u, v)
+            self._shift_degree(u, 1)
+            self._shift_degree(v, 1)
+        self.edge_count += len(edges)
+
+        if self.bfs_root is not None and edges:
+            self._refresh_bfs_tree()
+            for (u, v) in edges:
+                self._relax(u, v)
+                self._relax(v, u)
+            reached = {node for edge in edges for node in edge if node in self.distances}
+            self._propagate(deque(sorted(reached, key=self.distances.get)))
+
+    def add_clique(self, members):
+        """
+        Register a new clique, its members must not have been adjacent before
+
+        params:
+            members: iterable of the indices of the members
+        """
+        members = list(members)
+        self._link_clique(members)
+
+        if self.bfs_root is not None:
+            self._refresh_bfs_tree()
+            reached = [member for member in members if member in self.distances]
+            if reached:
+                closest = min(reached, key=self.distances.get)
+                for member in members:
+                    self._relax(closest, member)
+                self._propagate(deque(sorted(members, key=self.distances.get)))
+
+    def leave_cliques(self, changes):
+        """
+        Register nodes leaving their cliques
+
+        params:
+            changes: list of (remaining, leaving) member sets as returned by GraphNetX.leave_cliques
+        """
+        for remaining, leaving in changes:
+            size = len(remaining) + len(leaving)
+            for node in leaving:
+                self._shift_degree(node, 1 - size)
+            for node in remaining:
+                self._shift_degree(node, -len(leaving))
+            self.edge_count -= len(leaving) * (len(leaving) - 1) // 2 + len(leaving) * len(remaining)
+
+            self.dirty_components.add(self.components_.find(next(iter(leaving))))
+
+            for node in leaving:
+                parent = self.bfs_parents.get(node)
+                if parent in leaving or parent in remaining:
+                    self.dirty_subtrees.add(node)
+            for node in remaining:
+                if self.bfs_parents.get(node) in leaving:
+                    self.dirty_subtrees.add(node)
+
+    def remove_edge(self, node1, node2):
+        """
+        Register the removal of an edge
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        """
+        self._shift_degree(node1, -1)
+        self._shift_degree(node2, -1)
+        self.edge_count -= 1
+
+        self.dirty_components.add(self.components_.find(node1))
+        self._cut_tree_edge(node1, node2)
+
+    def remove_edges(self, edges):
+        """
+        Register the removal of several edges
+
+        params:
+            edges: list of (node1, node2) tuples
+        """
+        for (u, v) in edges:
+            self.remove_edge(u, v)
+
+    def remove_node(self, node, neighbors):
+        """
+        Register the removal of a node and of its edges
+
+        params:
+            node: the index of the removed node
+            neighbors: the nodes that were adjacent to the removed node
+        """
+        for neighbor in neighbors:
+            self._shift_degree(neighbor, -1)
+            self.edge_count -= 1
+            self._cut_tree_edge(node, neighbor)
+
+        degree = self.degrees.pop(node)
+        self.degree_histogram[degree] -= 1
+        self._drop_empty_degree(degree)
+
+        root = self.components_.find(node)
+        self.component_members[root].discard(node)
+        self.removed_nodes.add(node)
+        self.dirty_components.add(root)
+
+        if node == self.bfs_root:
+            self.set_bfs_root(None)
+        elif node in self.distances:
+            self.dirty_subtrees.discard(node)
+            self._detach(node)
+            del self.distances[node]
+            self.bfs_children.pop(node, None)
+
+    """ Queries """
+    def component_count(self):
+        """
+        Get the number of connected components
+
+        returns:
+            the number of connected components
+        """
+        self._refresh_components()
+        return len(self.component_members)
+
+    def component_of(self, node):
+        """
+        Get the representative of the component of a node
+
+        params:
+            node: the index of the node
+        returns:
+            the node representing its component
+        """
+        self._refresh_components()
+        return self.components_.find(node)
+
+    def connected(self, node1, node2):
+        """
+        Check if two nodes are in the same connected component
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        returns:
+            True if a path links the two nodes, False otherwise
+        """
+        return self.component_of(node1) == self.component_of(node2)
+
+    def components(self):
+        """
+        Get the connected components
+
+        returns:
+            a list of sets of nodes
+        """
+        self._refresh_components()
+        return list(self.component_members.values())
+
+    def degree_stats(self):
+        """
+        Get the degree statistics of the graph
+
+        returns:
+            a dictionary with the node and edge counts, the min, max and mean degree and the degree histogram
+        """
+        node_count = len(self.degrees)
+        return {
+            "nodes": node_count,
+            "edges": self.edge_count,
+            "min": min(self.degree_histogram) if node_count else None,
+            "max": max(self.degree_histogram) if node_count else None,
+            "mean": 2 * self.edge_count / node_count if node_count else 0.0,
+            "histogram": dict(sorted(self.degree_histogram.items())),
+        }
+
+    def set_bfs_root(self, root):
+        """
+        Choose the root of the maintained BFS tree and compute it
+
+        params:
+            root: the index of the root node, or None to stop maintaining a BFS tree
+        """
+        self.bfs_root = root
+        self.distances = {}
+        self.bfs_parents = {}
+        self.bfs_children = {}
+        self.dirty_subtrees.clear()
+
+        if root is not None:
+            self.distances[root] = 0
+            self.bfs_parents[root] = None
+            self._propagate(deque([root]))
+
+    def bfs_tree(self):
+        """
+        Get the maintained BFS tree
+
+        returns:
+            distances: a dictionary mapping each reachable node to its distance from the root
+            parents: a dictionary mapping each reachable node to its parent in the tree
+        """
+        self._refresh_bfs_tree()
+        return self.distances, self.bfs_parents
+
+    def bfs_depth(self):
+        """
+        Get the depth of the maintained BFS tree
+
+        returns:
+            the largest distance from the root, or None if there is no root
+        """
+        if self.bfs_root is None:
+            return None
+        return max(self.bfs_tree()[0].values())
+
+    """ Private helpers """
+    def _shift_degree(self, node, delta):
+        """ Move a node to another bucket of the degree histogram """
+        degree = self.degrees[node]
+        self.degree_histogram[degree] -= 1
+        self._drop_empty_degree(degree)
+        self.degrees[node] = degree + delta
+        self.degree_histogram[degree + delta] += 1
+
+    def _drop_empty_degree(self, degree):
+        """ Remove an empty bucket from the degree histogram """
+        if self.degree_histogram[degree] == 0:
+            del self.degree_histogram[degree]
+
+    def _link_clique(self, members):
+        """ Merge the components and update the degrees of the members of a new clique """
+        for member in members[1:]:
+            self._merge(members[0], member)
+        for member in members:
+            self._shift_degree(member, len(members) - 1)
+        self.edge_count += len(members) * (len(members) - 1) // 2
+
+    def _neighbors(self, node, expanded, distance=0):
+        """
+        Get the explicit neighbors of a node, plus the members of its clique
+
+        The clique members are only returned when the clique was not already expanded from a node at
+        the same or a smaller distance, which keeps traversals linear in the clique size
+        """
+        clique_id = self.graph.node_clique.get(node)
+        if clique_id is None or expanded.get(clique_id, float("inf")) <= distance:
+            return self.graph.explicit_neighbors(node)
+        expanded[clique_id] = distance
+        return chain(self.graph.explicit_neighbors(node), self.graph.cliques[clique_id])
+
+    def _merge(self, node1, node2):
+        """ Merge the components of two nodes, keeping the dirty flag of either side """
+        root1 = self.components_.find(node1)
+        root2 = self.components_.find(node2)
+        root = self.components_.union(root1, root2)
+        if root is None:
+            return
+
+        absorbed = root2 if root == root1 else root1
+        members = self.component_members.pop(absorbed)
+        self.component_members[root] |= members
+
+        if absorbed in self.dirty_components:
+            self.dirty_components.discard(absorbed)
+            self.dirty_components.add(root)
+
+    def _refresh_components(self):
+        """ Split the dirty components again by traversing only their own nodes """
+        if not self.dirty_components:
+            return
+
+        for root in self.dirty_components:
+            members = self.component_members.pop(root)
+            for node in members:
+                self.components_.reset(node)
+
+            for node in members:
+                if self.components_.parent[node] != node:
+                    continue
+                component = {node}
+                queue = deque([node])
+                expanded = {}
+                while queue:
+                    current = queue.popleft()
+                    for neighbor in self._neighbors(current, expanded):
+                        if neighbor not in component:
+                            component.add(neighbor)
+                            self.components_.parent[neighbor] = node
+                            self.components_.size.pop(neighbor, None)
+                            queue.append(neighbor)
+                self.components_.size[node] = len(component)
+                self.component_members[node] = component
+
+        for node in self.removed_nodes:
+            self.components_.discard(node)
+            self.component_members.pop(node, None)
+
+        self.dirty_components.clear()
+        self.removed_nodes.clear()
+
+    def _relax(self, source, target):
+        """ Shorten the BFS distance of a target through a source """
+        if source in self.distances and self.distances[source] + 1 < self.distances.get(target, float("inf")):
+            self._attach(target, source, self.distances[source] + 1)
+
+    def _propagate(self, queue):
+        """ Breadth-first propagation of improved distances """
+        expanded = {}
+        while queue:
+            node = queue.popleft()
+            distance = self.distances[node] + 1
+            for neighbor in self._neighbors(node, expanded, distance):
+                if distance < self.distances.get(neighbor, float("inf")):
+                    self._attach(neighbor, node, distance)
+                    queue.append(neighbor)
+
+    def _attach(self, node, parent, distance):
+        """ Set the distance and the parent of a node in the BFS tree """
+        self._detach(node)
+        self.distances[node] = distance
+        self.bfs_parents[node] = parent
+        self.bfs_children.setdefault(parent, set()).add(node)
+
+    def _detach(self, node):
+        """ Unlink a node from its parent in the BFS tree """
+        children = self.bfs_children.get(self.bfs_parents.pop(node, None))
+        if children:
+            children.discard(node)
+
+    def _cut_tree_edge(self, node1, node2):
+        """ Mark the subtree hanging from a removed tree edge as dirty """
+        for parent, child in ((node1, node2), (node2, node1)):
+            if self.bfs_parents.get(child) == parent:
+                self.dirty_subtrees.add(child)
+
+    def _refresh_bfs_tree(self):
+        """
+        Recompute the distances of the dirty subtrees only
+
+        Every node of a dirty subtree loses its distance, then gets the best distance offered by its
+        still valid neighbors and the improvements are propagated inside the subtree in distance order
+        """
+        if not self.dirty_subtrees:
+            return
+
+        affected = set()
+        stack = list(self.dirty_subtrees)
+        while stack:
+            node = stack.pop()
+            if node in affected or node not in self.distances:
+                continue
+            affected.add(node)
+            stack.extend(self.bfs_children.get(node, ()))
+
+        for node in affected:
+            self._detach(node)
+            del self.distances[node]
+        for node in affected:
+            self.bfs_children.pop(node, None)
+
+        heap = []
+        closest_in_clique = {}
+        for node in affected:
+            candidates = list(self.graph.explicit_neighbors(node))
+            clique_id = self.graph.node_clique.get(node)
+            if clique_id is not None:
+                if clique_id not in closest_in_clique:
+                    reached = [member for member in self.graph.cliques[clique_id] if member in self.distances
+                               and member not in affected]
+                    closest_in_clique[clique_id] = min(reached, key=self.distances.get) if reached else None
+                if closest_in_clique[clique_id] is not None:
+                    candidates.append(closest_in_clique[clique_id])
+
+            for neighbor in candidates:
+                if neighbor in self.distances and self.distances[neighbor] + 1 < self.distances.get(node, float("inf")):
+                    self._attach(node, neighbor, self.distances[neighbor] + 1)
+            if node in self.distances:
+                heapq.heappush(heap, (self.distances[node], node))
+
+        expanded = {}
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance != self.distances[node]:
+                continue
+            for neighbor in self._neighbors(node, expanded, distance):
+                if neighbor in affected and distance + 1 < self.distances.get(neighbor, float("inf")):
+                    self._attach(neighbor, node, distance + 1)
+                    heapq.heappush(heap, (distance + 1, neighbor))
+
+        self.dirty_subtrees.clear()
@@ -1,22 +1,34 @@
+import os
 import sys
+import argparse
 import PyQt6.QtWidgets as QtWidgets
 from PyQt6.QtCore import Qt
 
+from algorithms import traversal_steps
 from graph_UI import InteractionArea
+from live_feed import LiveFeedServer
+from snapshot import load_session, save_session
+
+
+SESSION_PATH = os.path.join(os.path.expanduser("~"), ".graph_visualiser_session")
 
 
 class MainWindow(QtWidgets.QMainWindow):
     """ Main window for the Graph Visualizer application """
 
-    def __init__(self):
+    def __init__(self, listen=None, session_path=SESSION_PATH):
         """
         Initialize the main window with UI components
 
         Sets up the interaction area, buttons, and menu options for the user interface
+
+        params:
+            listen: name of the local socket to accept live graph updates on, or None to disable them
+            session_path: snapshot file the session is restored from and saved to on close, or None
         """
         super().__init__()
         self.setWindowTitle("Graph visualizer")
-        self.setFixedSize(700, 700)
+        self.resize(700, 700)
 
         container = QtWidgets.QWidget()
         self.setCentralWidget(container)
@@ -25,15 +37,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.interaction_area = InteractionArea()
         self.interaction_area.setStyleSheet("background-color: lightgray;")
         self.interaction_area.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
-        self.interaction_area.setFixedSize(600, 400)
-        main_layout.addWidget(self.interaction_area, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.interaction_area.setMinimumSize(300, 200)
+        main_layout.addWidget(self.interaction_area, stretch=1)
 
         self.method_combo_box = QtWidgets.QComboBox()
-        self.method_combo_box.addItems(["generate graph", "full link", "random link", "bfs", "dfs"])
+        self.method_combo_box.addItems([
+            "generate graph", "full link", "random link", "bfs", "dfs", "shortest path",
+            "kruskal", "prim", "topological sort", "articulation points", "coloration",
+        ])
         main_layout.addWidget(self.method_combo_box, alignment=Qt.AlignmentFlag.AlignCenter)
 
         buttons_layout = QtWidgets.QHBoxLayout()
         switch_layout = QtWidgets.QHBoxLayout()
+        kind_layout = QtWidgets.QHBoxLayout()
 
         self.run_button = QtWidgets.QPushButton("Run")
         self.run_button.clicked.connect(self.run_algorithm)
@@ -51,15 +67,38 @@ class MainWindow(QtWidgets.QMainWindow):
         self.link_nodes_switch.stateChanged.connect(self.link_nodes)
         switch_layout.addWidget(self.link_nodes_switch)
 
+        self.avoid_crossings_switch = QtWidgets.QCheckBox("Avoid Crossings")
+        self.avoid_crossings_switch.stateChanged.connect(self.avoid_crossings)
+        switch_layout.addWidget(self.avoid_crossings_switch)
+
+        self.count_crossings_switch = QtWidgets.QCheckBox("Count Crossings")
+        switch_layout.addWidget(self.count_crossings_switch)
+
+        self.directed_switch = QtWidgets.QCheckBox("Directed")
+        self.weighted_switch = QtWidgets.QCheckBox("Weighted")
+        self.multigraph_switch = QtWidgets.QCheckBox("Multigraph")
+        for switch in (self.directed_switch, self.weighted_switch, self.multigraph_switch):
+            switch.stateChanged.connect(self.change_graph_kind)
+            kind_layout.addWidget(switch)
+
         self.quit_button = QtWidgets.QPushButton("Quit")
         self.quit_button.clicked.connect(self.quit_application)
         buttons_layout.addWidget(self.quit_button)
 
         main_layout.addLayout(switch_layout)
+        main_layout.addLayout(kind_layout)
         main_layout.addLayout(buttons_layout)
 
         container.setLayout(main_layout)
 
+        self.session_path = session_path
+        self.restore_session()
+
+        self.live_feed = None
+        if listen is not None:
+            self.live_feed = LiveFeedServer(self.interaction_area, listen)
+            self.statusBar().showMessage(f"Listening on {self.live_feed.server.fullServerName()}")
+
     def run_algorithm(self):
         """
         Run the selected algorithm or graph operation
@@ -69,41 +108,107 @@ class MainWindow(QtWidgets.QMainWindow):
             full link,
             random link,
             bfs,
-            dfs
+            dfs,
+            shortest path between the two selected nodes,
+            minimum spanning tree (kruskal, prim),
+            topological sort,
+            articulation points and bridges,
+            coloration
         """
         selected_method = self.method_combo_box.currentText()
+        graph_logic = self.interaction_area.graph
 
         if selected_method == "generate graph":
-            self.interaction_area.graph.generate_graph()
+            graph_logic.generate_graph()
 
         elif selected_method == "full link":
-            self.interaction_area.graph.full_link_selected_nodes()
+            graph_logic.full_link_selected_nodes()
 
         elif selected_method == "random link":
-            self.interaction_area.graph.random_link_selected_nodes()
+            graph_logic.random_link_selected_nodes()
+
+        elif selected_method == "shortest path":
+            self.run_shortest_path()
+
+        elif selected_method in ("kruskal", "prim"):
+            graph_logic.clear_visualization()
+            start_node = next(iter(graph_logic.selected_circle), None)
+            steps, weight = graph_logic.minimum_spanning_tree(selected_method, start_node)
+            self.statusBar().showMessage(f"Spanning forest weight: {weight:g}")
+            self.interaction_area.visualize_algorithm(steps)
+
+        elif selected_method == "topological sort":
+            graph_logic.clear_visualization()
+            try:
+                steps, _ = graph_logic.topological_order()
+            except ValueError as error:
+                self.statusBar().showMessage(str(error))
+            else:
+                self.statusBar().showMessage("")
+                self.interaction_area.visualize_algorithm(steps)
+
+        elif selected_method == "articulation points":
+            graph_logic.clear_visualization()
+            steps, points, bridges = graph_logic.find_articulation_points()
+            self.statusBar().showMessage(f"Articulation points: {len(points)}, bridges: {len(bridges)}")
+            self.interaction_area.visualize_algorithm(steps)
+
+        elif selected_method == "coloration":
+            graph_logic.clear_visualization()
+            steps, colors = graph_logic.coloration()
+            self.statusBar().showMessage(f"Colors: {len(set(colors.values()))}")
+            self.interaction_area.visualize_algorithm(steps)
 
         else:
-            graph = self.interaction_area.graph.graph
+            graph = graph_logic.graph
 
-            if len(self.interaction_area.graph.selected_circle) == 1:
-                start_node = list(self.interaction_area.graph.selected_circle)[0]
+            if len(graph_logic.selected_circle) == 1:
+                start_node = list(graph_logic.selected_circle)[0]
 
             else:
-                self.interaction_area.graph.selected_circle.clear()
+                graph_logic.selected_circle.clear()
                 start_node = 0
 
             if selected_method == "bfs":
                 if graph.has_node(start_node):
-                    bfs_result, self.interaction_area.parents = graph.bfs(start_node)
-                    self.interaction_area.visualize_algorithm(bfs_result)
+                    graph_logic.clear_visualization()
+                    self.interaction_area.visualize_algorithm(traversal_steps(*graph.bfs(start_node)))
 
             elif selected_method == "dfs":
                 if graph.has_node(start_node):
-                    dfs_result, self.interaction_area.parents = graph.dfs(start_node)
-                    self.interaction_area.visualize_algorithm(dfs_result)
+                    graph_logic.clear_visualization()
+                    self.interaction_area.visualize_algorithm(traversal_steps(*graph.dfs(start_node)))
+
+        linking_methods = ("generate graph", "full link", "random link")
+        if selected_method in linking_methods and self.count_crossings_switch.isChecked():
+            self.statusBar().showMessage(f"Crossings: {graph_logic.crossing_count()}")
 
         self.update()
 
+    def run_shortest_path(self):
+        """
+        Visualize the shortest path between the two selected nodes
+
+        In a directed graph the path from the smallest node index is tried first, then the reverse path
+        """
+        graph = self.interaction_area.graph
+        if len(graph.selected_circle) != 2:
+            self.statusBar().showMessage("Select two nodes to find a path")
+            return
+
+        start_node, end_node = sorted(graph.selected_circle)
+        steps, weight = graph.shortest_path(start_node, end_node)
+        if not steps and graph.graph.directed:
+            steps, weight = graph.shortest_path(end_node, start_node)
+
+        if not steps:
+            self.statusBar().showMessage("No path between the selected nodes")
+            return
+
+        self.statusBar().showMessage(f"Path weight: {weight:g}")
+        graph.clear_visualization()
+        self.interaction_area.visualize_algorithm(steps)
+
     def clear_display(self):
         """ Clear all nodes and edges from the graph """
         self.interaction_area.graph.clear_circles()
@@ -119,12 +224,70 @@ class MainWindow(QtWidgets.QMainWindow):
         self.interaction_area.graph.link_nodes()
         self.update()
 
+    def avoid_crossings(self):
+        """ Enables or disables crossing avoidance when nodes are linked randomly """
+        self.interaction_area.graph.avoid_crossings()
+        self.update()
+
+    def change_graph_kind(self):
+        """ Convert the graph to the kind selected with the directed, weighted and multigraph switches """
+        self.interaction_area.reset_visualization()
+        self.interaction_area.graph.set_graph_kind(
+            directed=self.directed_switch.isChecked(),
+            weighted=self.weighted_switch.isChecked(),
+            multigraph=self.multigraph_switch.isChecked(),
+        )
+        self.update()
+
+    def restore_session(self):
+        """ Restore the graph, the selection and any running traversal from the session snapshot """
+        if self.session_path is None or not os.path.exists(self.session_path):
+            return
+
+        try:
+            load_session(self.session_path, self.interaction_area.graph)
+        except (OSError, ValueError, KeyError):
+            self.interaction_area.graph.clear_circles()
+            return
+
+        graph = self.interaction_area.graph
+        for switch, value in ((self.link_nodes_switch, graph.link_node_value),
+                              (self.avoid_crossings_switch, graph.avoid_crossings_value),
+                              (self.directed_switch, graph.graph.directed),
+                              (self.weighted_switch, graph.graph.weighted),
+                              (self.multigraph_switch, graph.graph.multigraph)):
+            switch.blockSignals(True)
+            switch.setChecked(value)
+            switch.blockSignals(False)
+
+        self.interaction_area.resume_visualization()
+
+    def closeEvent(self, event):
+        """
+        Save the session snapshot before closing
+
+        params:
+            event: the close event
+        """
+        if self.session_path is not None:
+            try:
+                save_session(self.session_path, self.interaction_area.graph)
+            except OSError:
+                pass
+        super().closeEvent(event)
+
     def quit_application(self):
         """ Close the application """
         self.close()
 
 
-app = QtWidgets.QApplication(sys.argv)
-main_window = MainWindow()
+parser = argparse.ArgumentParser(description="Graph visualizer")
+parser.add_argument("--listen", metavar="NAME", help="accept live graph updates on the local socket NAME")
+parser.add_argument("--session", metavar="PATH", default=SESSION_PATH, help="session snapshot to restore and save")
+args, qt_args = parser.parse_known_args()
+
+QtWidgets.QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+main_window = MainWindow(listen=args.listen, session_path=args.session)
 main_window.show()
 sys.exit(app.exec())
@@ -0,0 +1,192 @@
+"""
+Generate random graphs in parallel and write their statistics to a columnar file
+
+Each graph goes through the same pipeline as the GUI, GraphLogic.generate_graph. One row is written per graph
+with its degree distribution, its number of connected components and the depth of a BFS tree rooted at its
+smallest node. Rows are written one chunk at a time in the order of the graphs, to Parquet if pyarrow is installed
+and to CSV otherwise
+
+Usage:
+    python batch.py [--graphs N] [--workers W] [--chunk C] [--seed S] [--allow-crossings] [--output PATH]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from graph_logic import EDGE_MAX, GraphLogic
+
+
+COLUMNS = ["graph", "nodes", "edges", "components", "bfs_depth", "min_degree", "max_degree", "mean_degree"] + [
+    f"degree_{degree}" for degree in range(EDGE_MAX + 1)
+]
+FLOAT_COLUMNS = {"mean_degree"}
+
+
+def graph_statistics(index, seed, avoid_crossings=True):
+    """
+    Generate one random graph and compute its statistics
+
+    The random generator is seeded from the seed of the batch and the index of the graph,
+    so a batch gives the same rows whatever the number of workers
+
+    params:
+        index: the index of the graph in the batch
+        seed: the seed of the batch
+        avoid_crossings: True to reject edges crossing existing ones when linking
+    returns:
+        the row of the graph, aligned with COLUMNS. The last degree column counts the nodes of degree EDGE_MAX or more
+    """
+    random.seed(f"{seed}:{index}")
+
+    graph_logic = GraphLogic()
+    graph_logic.generate_graph(avoid_crossings)
+    nodes = graph_logic.graph.get_nodes()
+
+    analysis = graph_logic.analysis
+    analysis.set_bfs_root(min(nodes) if nodes else None)
+    stats = analysis.degree_stats()
+
+    degrees = [0] * (EDGE_MAX + 1)
+    for degree, count in stats["histogram"].items():
+        degrees[min(degree, EDGE_MAX)] += count
+
+    return [index, stats["nodes"], stats["edges"], analysis.component_count(), analysis.bfs_depth(),
+            stats["min"], stats["max"], stats["mean"]] + degrees
+
+
+def run_chunk(start, stop, seed, avoid_crossings=True):
+    """
+    Compute the statistics of a range of graphs, in a worker process
+
+    params:
+        start: the index of the first graph
+        stop: the index after the last graph
+        seed: the seed of the batch
+        avoid_crossings: True to reject edges crossing existing ones when linking
+    returns:
+        a dictionary mapping each column name to its list of values
+    """
+    rows = [graph_statistics(index, seed, avoid_crossings) for index in range(start, stop)]
+    return {name: [row[column] for row in rows] for column, name in enumerate(COLUMNS)}
+
+
+class ParquetOutput:
+    """ Parquet file written one row group per chunk """
+    def __init__(self, path):
+        """
+        Create the file
+
+        params:
+            path: the path of the Parquet file
+        """
+        self.path = path
+        self.schema = pyarrow.schema([
+            (name, pyarrow.float64() if name in FLOAT_COLUMNS else pyarrow.int64()) for name in COLUMNS
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, columns):
+        """
+        Append a chunk of rows
+
+        params:
+            columns: a dictionary mapping each column name to its list of values
+        """
+        self.writer.write_table(pyarrow.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        """ Write the footer and close the file """
+        self.writer.close()
+
+
+class CsvOutput:
+    """ CSV file flushed after each chunk, used when pyarrow is not installed """
+    def __init__(self, path):
+        """
+        Create the file and write the header
+
+        params:
+            path: the path of the CSV file
+        """
+        self.path = path
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, columns):
+        """
+        Append a chunk of rows
+
+        params:
+            columns: a dictionary mapping each column name to its list of values
+        """
+        self.writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+        self.file.flush()
+
+    def close(self):
+        """ Close the file """
+        self.file.close()
+
+
+def open_output(path):
+    """
+    Open the output file, falling back to CSV next to the requested path if Parquet is not available
+
+    params:
+        path: the requested path, Parquet is used if it ends with .parquet
+    returns:
+        a ParquetOutput or a CsvOutput
+    """
+    root, extension = os.path.splitext(path)
+    if extension != ".parquet":
+        return CsvOutput(path)
+    if pyarrow is not None:
+        return ParquetOutput(path)
+
+    print(f"pyarrow is not installed, writing {root}.csv instead", file=sys.stderr)
+    return CsvOutput(root + ".csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--graphs", type=int, default=1000, help="number of graphs to generate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--chunk", type=int, default=50, help="number of graphs per task and per row group")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the batch")
+    parser.add_argument("--allow-crossings", action="store_true", help="link without rejecting crossing edges")
+    parser.add_argument("--output", default="graph_stats.parquet", help="output file, .parquet or .csv")
+    args = parser.parse_args()
+
+    output = open_output(args.output)
+    start_time = time.perf_counter()
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        tasks = [executor.submit(run_chunk, start, min(start + args.chunk, args.graphs), args.seed,
+                                 not args.allow_crossings)
+                 for start in range(0, args.graphs, args.chunk)]
+        try:
+            for task in tasks:
+                columns = task.result()
+                output.write(columns)
+                done += len(columns["graph"])
+                rate = done / (time.perf_counter() - start_time)
+                print(f"\r{done}/{args.graphs} graphs, {rate:.0f} graphs/s", end="", file=sys.stderr, flush=True)
+        finally:
+            output.close()
+
+    print(f"\nWrote {done} graphs to {output.path} in {time.perf_counter() - start_time:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+from array import array
+
+
+def manhattan_distance_to_segment(px, py, ax, ay, bx, by):
+    """
+    Compute the smallest manhattan distance between a point and a segment
+
+    The distance along the segment is a convex piecewise-linear function of the segment parameter,
+    so its minimum is reached at an end of the segment or where one of the two terms cancels out
+
+    params:
+        px, py: the coordinates of the point
+        ax, ay: the coordinates of the start of the segment
+        bx, by: the coordinates of the end of the segment
+    returns:
+        the manhattan distance between the point and the closest point of the segment
+    """
+    dx = bx - ax
+    dy = by - ay
+    candidates = [0.0, 1.0]
+    if dx:
+        candidates.append((px - ax) / dx)
+    if dy:
+        candidates.append((py - ay) / dy)
+
+    return min(abs(ax + t * dx - px) + abs(ay + t * dy - py) for t in candidates if 0.0 <= t <= 1.0)
+
+
+class PositionStore:
+    """
+    Node positions kept in contiguous integer coordinate arrays
+
+    Each node owns a slot of the x and y arrays, removed nodes are swapped with the last slot.
+    A uniform grid of cell_size buckets the slots, so proximity queries only read the cells
+    overlapping the query box instead of every position
+    """
+    def __init__(self, cell_size):
+        """
+        Initialize an empty store
+
+        params:
+            cell_size: the side of the grid cells, queries are cheapest with a radius close to it
+        """
+        self.cell_size = cell_size
+        self.xs = array("i")
+        self.ys = array("i")
+        self.ids = []
+        self.slots = {}
+        self.grid = {}
+
+    def __setitem__(self, node, position):
+        if node in self.slots:
+            del self[node]
+
+        x, y = position
+        self.slots[node] = len(self.ids)
+        self.ids.append(node)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.grid.setdefault(self._cell(x, y), set()).add(node)
+
+    def __getitem__(self, node):
+        slot = self.slots[node]
+        return self.xs[slot], self.ys[slot]
+
+    def __delitem__(self, node):
+        slot = self.slots.pop(node)
+        cell = self._cell(self.xs[slot], self.ys[slot])
+        self.grid[cell].discard(node)
+        if not self.grid[cell]:
+            del self.grid[cell]
+
+        last_node = self.ids.pop()
+        last_x = self.xs.pop()
+        last_y = self.ys.pop()
+        if last_node != node:
+            self.ids[slot] = last_node
+            self.xs[slot] = last_x
+            self.ys[slot] = last_y
+            self.slots[last_node] = slot
+
+    def __contains__(self, node):
+        return node in self.slots
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def keys(self):
+        """
+        Get the stored nodes
+
+        returns:
+            an iterator over the node indices
+        """
+        return iter(self.ids)
+
+    def values(self):
+        """
+        Get the stored positions
+
+        returns:
+            an iterator over (x, y) tuples
+        """
+        return zip(self.xs, self.ys)
+
+    def items(self):
+        """
+        Get the stored nodes with their position
+
+        returns:
+            an iterator over (node, (x, y)) tuples
+        """
+        return zip(self.ids, zip(self.xs, self.ys))
+
+    def clear(self):
+        """ Remove every position """
+        self.xs = array("i")
+        self.ys = array("i")
+        self.ids.clear()
+        self.slots.clear()
+        self.grid.clear()
+
+    def load(self, ids, xs, ys):
+        """
+        Replace every position with the given columns
+
+        params:
+            ids: sequence of node indices
+            xs: array('i') of x coordinates, aligned with ids
+            ys: array('i') of y coordinates, aligned with ids
+        """
+        self.clear()
+        self.ids = list(ids)
+        self.xs = array("i", xs)
+        self.ys = array("i", ys)
+        self.slots = {node: slot for slot, node in enumerate(self.ids)}
+        for node, x, y in zip(self.ids, self.xs, self.ys):
+            self.grid.setdefault(self._cell(x, y), set()).add(node)
+
+    def in_box(self, min_x, min_y, max_x, max_y):
+        """
+        Get the nodes stored in the grid cells overlapping a box
+
+        The result may contain nodes slightly outside the box, it is meant as a candidate list
+
+        params:
+            min_x, min_y: the top-left corner of the box
+            max_x, max_y: the bottom-right corner of the box
+        returns:
+            an iterator over the node indices
+        """
+        min_cell_x, min_cell_y = self._cell(min_x, min_y)
+        max_cell_x, max_cell_y = self._cell(max_x, max_y)
+
+        if (max_cell_x - min_cell_x + 1) * (max_cell_y - min_cell_y + 1) > len(self.grid):
+            for (cell_x, cell_y), nodes in self.grid.items():
+                if min_cell_x <= cell_x <= max_cell_x and min_cell_y <= cell_y <= max_cell_y:
+                    yield from nodes
+            return
+
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                yield from self.grid.get((cell_x, cell_y), ())
+
+    def nearest(self, x, y, radius):
+        """
+        Find the closest node within a manhattan radius of a point
+
+        params:
+            x, y: the coordinates of the point
+            radius: the largest accepted manhattan distance
+        returns:
+            the index of the closest node, or None if no node is close enough
+        """
+        best_node, best_distance = None, radius
+        for node in self.in_box(x - radius, y - radius, x + radius, y + radius):
+            slot = self.slots[node]
+            distance = abs(self.xs[slot] - x) + abs(self.ys[slot] - y)
+            if distance <= best_distance:
+                best_node, best_distance = node, distance
+        return best_node
+
+    def any_closer_than(self, x, y, distance, exclude=()):
+        """
+        Check if a node lies strictly closer than a manhattan distance to a point
+
+        params:
+            x, y: the coordinates of the point
+            distance: the manhattan distance
+            exclude: nodes to ignore
+        returns:
+            True if such a node exists, False otherwise
+        """
+        for node in self.in_box(x - distance, y - distance, x + distance, y + distance):
+            slot = self.slots[node]
+            if abs(self.xs[slot] - x) + abs(self.ys[slot] - y) < distance and node not in exclude:
+                return True
+        return False
+
+    def any_near_segment(self, start, end, distance, exclude=()):
+        """
+        Check if a node lies strictly closer than a manhattan distance to a segment
+
+        params:
+            start: (x, y) tuple of the start of the segment
+            end: (x, y) tuple of the end of the segment
+            distance: the manhattan distance
+            exclude: nodes to ignore
+        returns:
+            True if such a node exists, False otherwise
+        """
+        (ax, ay), (bx, by) = start, end
+        candidates = self.in_box(min(ax, bx) - distance, min(ay, by) - distance,
+                                 max(ax, bx) + distance, max(ay, by) + distance)
+        for node in candidates:
+            if node in exclude:
+                continue
+            slot = self.slots[node]
+            if manhattan_distance_to_segment(self.xs[slot], self.ys[slot], ax, ay, bx, by) < distance:
+                return True
+        return False
+
+    def _cell(self, x, y):
+        """ Get the grid cell containing a point """
+        return x // self.cell_size, y // self.cell_size
@@ -1,13 +1,126 @@
 import networkx as nx
+from array import array
 from collections import deque
+from itertools import chain
 
 from random import randint
 
-class GraphNetX:
-    """ Graph management using NetworkX """
+from id_allocator import IdAllocator
+from priority_queue import IndexedHeap
+from result_cache import ResultCache
+
+
+DEFAULT_WEIGHT = 1.0
+GRAPH_CLASSES = {
+    (False, False): nx.Graph,
+    (True, False): nx.DiGraph,
+    (False, True): nx.MultiGraph,
+    (True, True): nx.MultiDiGraph,
+}
+
+
+def edge_key(node1, node2):
+    """
+    Get the canonical key of an undirected edge
+
+    params:
+        node1: the index of the first node
+        node2: the index of the second node
+    returns:
+        the (smallest, largest) tuple of the two node indices
+    """
+    return (node1, node2) if node1 <= node2 else (node2, node1)
+
+
+class EdgeOverlay:
+    """
+    Per-edge state layer (visited edges, shortest path, coloring conflicts...)
+
+    The state is a flag array indexed by edge ID, so membership is a single index and
+    iterating the flagged edges is a C-level scan of the array
+    """
     def __init__(self):
-        """ Initialize an empty graph """
-        self.graph = nx.Graph()
+        """ Initialize an empty overlay """
+        self._flags = bytearray()
+        self._count = 0
+
+    def add(self, edge_id):
+        """
+        Flag an edge
+
+        params:
+            edge_id: the ID of the edge
+        """
+        if edge_id >= len(self._flags):
+            self._flags.extend(bytes(edge_id + 1 - len(self._flags)))
+        if not self._flags[edge_id]:
+            self._flags[edge_id] = 1
+            self._count += 1
+
+    def discard(self, edge_id):
+        """
+        Unflag an edge if it is flagged
+
+        params:
+            edge_id: the ID of the edge
+        """
+        if edge_id in self:
+            self._flags[edge_id] = 0
+            self._count -= 1
+
+    def clear(self):
+        """ Unflag all edges """
+        self._flags = bytearray()
+        self._count = 0
+
+    def __contains__(self, edge_id):
+        return edge_id is not None and 0 <= edge_id < len(self._flags) and self._flags[edge_id] == 1
+
+    def __iter__(self):
+        index = self._flags.find(1)
+        while index != -1:
+            yield index
+            index = self._flags.find(1, index + 1)
+
+    def __len__(self):
+        return self._count
+
+
+class GraphNetX:
+    """
+    Graph management using NetworkX
+
+    The graph can be directed, weighted and/or a multigraph. Every explicit edge has an ID,
+    its weight is stored in an array indexed by this ID rather than in the NetworkX attribute dict,
+    and in a multigraph the ID is also the NetworkX key of the edge.
+    Every mutation bumps the version of the graph, which keys the cached algorithm results
+    """
+    def __init__(self, directed=False, weighted=False, multigraph=False):
+        """
+        Initialize an empty graph
+
+        params:
+            directed: True for edges going from their first node to their second node
+            weighted: True to give each edge a weight, DEFAULT_WEIGHT is used otherwise
+            multigraph: True to allow several edges between the same nodes
+        """
+        self.directed = directed
+        self.weighted = weighted
+        self.multigraph = multigraph
+        self.graph = GRAPH_CLASSES[(directed, multigraph)]()
+
+        self.edge_ids = {}
+        self.weights = array("d")
+        self._free_edge_ids = []
+        self._next_edge_id = 0
+        self.overlays = {}
+
+        self.cliques = {}
+        self.node_clique = {}
+        self.clique_ids = IdAllocator(reuse_ids=True)
+
+        self.version = 0
+        self.results = ResultCache()
 
     def add_node(self, node):
         """
@@ -16,45 +129,392 @@ class GraphNetX:
         params:
             node: the index of the node to be added
         """
+        self.version += 1
         self.graph.add_node(node)
 
-    def del_node(self, node):
+    def add_edge(self, node1, node2, weight=DEFAULT_WEIGHT):
         """
-        Delete a node from the graph
+        Add an edge between two nodes
+
+        In a multigraph a new parallel edge is added even if the nodes are already linked
 
         params:
-            node: the index of the node to be removed
+            node1: the index of the first node
+            node2: the index of the second node
+            weight: the weight of the edge, ignored if the graph is not weighted
         """
-        if node in self.graph:
-            self.graph.remove_node(node)
+        self.add_edges([(node1, node2, weight)])
 
-    def add_edge(self, node1, node2):
+    def remove_edge(self, node1, node2):
         """
-        Add an edge between two nodes
+        Remove an edge between two nodes
+
+        In a multigraph only the most recently added edge is removed.
+        Removing an edge implied by a clique takes node1 out of the clique
+        and links it explicitly to the other members except node2
 
         params:
             node1: the index of the first node
             node2: the index of the second node
+        returns:
+            True if the two nodes are no longer adjacent in any direction, False otherwise
         """
-        self.graph.add_edge(node1, node2)
+        self.version += 1
+        if self.in_same_clique(node1, node2):
+            members = self.cliques[self.node_clique[node1]]
+            self.leave_cliques([node1])
+            edges = [(node1, member) for member in members if member != node2]
+            if self.directed:
+                edges += [(member, node1) for member in members if member != node2]
+            self.add_edges(edges)
+            return True
+
+        if self.multigraph:
+            edge_id = list(self.graph[node1][node2])[-1]
+            self.graph.remove_edge(node1, node2, key=edge_id)
+        else:
+            edge_id = self.edge_ids.pop(self.key(node1, node2))
+            self.graph.remove_edge(node1, node2)
+        self._release_edge_id(edge_id)
+        return not self._adjacent(node1, node2)
+
+    def add_nodes(self, nodes):
+        """
+        Add several nodes to the graph at once
 
-    def remove_edge(self, node1, node2):
+        params:
+            nodes: iterable of the indices of the nodes to be added
         """
-        Remove an edge between two nodes
+        self.version += 1
+        self.graph.add_nodes_from(nodes)
+
+    def remove_nodes(self, nodes):
+        """
+        Delete several nodes and their edges from the graph at once
+
+        params:
+            nodes: iterable of the indices of the nodes to be removed
+        """
+        self.version += 1
+        nodes = [node for node in nodes if node in self.graph]
+        self.leave_cliques(nodes)
+        self._release_incident_edges(nodes)
+        self.graph.remove_nodes_from(nodes)
+
+    def add_edges(self, edges):
+        """
+        Add several edges to the graph at once
+
+        Self-loops and edges between members of the same clique are ignored, and so are existing edges
+        unless the graph is a multigraph
+
+        params:
+            edges: iterable of (node1, node2) or (node1, node2, weight) tuples
+        returns:
+            the list of (smallest, largest) node pairs that were not adjacent in any direction yet
+        raises:
+            ValueError: if a weight is negative, no edge is added then
+        """
+        self.version += 1
+        edges = list(edges)
+        for edge in edges:
+            if len(edge) > 2 and edge[2] < 0:
+                raise ValueError(f"negative weight {edge[2]} for edge {edge[0]} -> {edge[1]}")
+
+        new_pairs = []
+        linked = set()
+        accepted = []
+        for edge in edges:
+            u, v = edge[0], edge[1]
+            weight = edge[2] if len(edge) > 2 else DEFAULT_WEIGHT
+            key = self.key(u, v)
+            if u == v or (not self.multigraph and key in self.edge_ids) or self.in_same_clique(u, v):
+                continue
+            pair = edge_key(u, v)
+            if pair not in linked and not self._adjacent(u, v):
+                new_pairs.append(pair)
+            linked.add(pair)
+
+            edge_id = self._allocate_edge_id(weight)
+            if self.multigraph:
+                accepted.append((u, v, edge_id, {}))
+            else:
+                self.edge_ids[key] = edge_id
+                accepted.append((u, v))
+
+        self.graph.add_edges_from(accepted)
+        return new_pairs
+
+    def remove_edges(self, edges):
+        """
+        Remove several edges from the graph at once, all the parallel edges of a multigraph are removed
+
+        params:
+            edges: iterable of (node1, node2) tuples
+        returns:
+            the list of (smallest, largest) node pairs that are no longer adjacent in any direction
+        """
+        self.version += 1
+        removed_pairs = []
+        for (u, v) in edges:
+            if not self.graph.has_edge(u, v):
+                continue
+
+            if self.multigraph:
+                edge_ids = list(self.graph[u][v])
+                self.graph.remove_edges_from((u, v, edge_id) for edge_id in edge_ids)
+            else:
+                edge_ids = [self.edge_ids.pop(self.key(u, v))]
+                self.graph.remove_edge(u, v)
+            for edge_id in edge_ids:
+                self._release_edge_id(edge_id)
+
+            if not self._adjacent(u, v):
+                removed_pairs.append(edge_key(u, v))
+        return removed_pairs
+
+    def incident_edges(self, nodes):
+        """
+        Get the explicit edges touching a group of nodes
+
+        params:
+            nodes: iterable of node indices
+        returns:
+            the set of (node1, node2) tuples, parallel edges are listed once
+        """
+        edges = set()
+        for node in nodes:
+            if node in self.graph:
+                edges.update(self.key(u, v) for (u, v) in self.graph.edges(node))
+                if self.directed:
+                    edges.update(self.graph.in_edges(node))
+        return edges
+
+    def add_clique(self, nodes):
+        """
+        Fully connect a group of nodes without materializing its edges
+
+        The members must not be adjacent to each other nor belong to another clique yet
+
+        params:
+            nodes: iterable of the indices of the members
+        returns:
+            the ID of the clique
+        """
+        self.version += 1
+        clique_id = self.clique_ids.allocate()
+        self.cliques[clique_id] = set(nodes)
+        for node in self.cliques[clique_id]:
+            self.node_clique[node] = clique_id
+        return clique_id
+
+    def leave_cliques(self, nodes):
+        """
+        Take nodes out of their cliques, dropping the cliques left with less than two members
+
+        params:
+            nodes: iterable of the indices of the nodes
+        returns:
+            a list of (remaining, leaving) tuples of member sets, one per clique that lost members
+        """
+        self.version += 1
+        leaving_by_clique = {}
+        for node in nodes:
+            clique_id = self.node_clique.pop(node, None)
+            if clique_id is not None:
+                leaving_by_clique.setdefault(clique_id, set()).add(node)
+
+        changes = []
+        for clique_id, leaving in leaving_by_clique.items():
+            remaining = self.cliques[clique_id]
+            remaining -= leaving
+            changes.append((remaining, leaving))
+            if len(remaining) < 2:
+                for node in remaining:
+                    del self.node_clique[node]
+                del self.cliques[clique_id]
+                self.clique_ids.release(clique_id)
+        return changes
+
+    def in_same_clique(self, node1, node2):
+        """
+        Check if two distinct nodes are linked by a clique
 
         params:
             node1: the index of the first node
             node2: the index of the second node
+        returns:
+            True if both nodes belong to the same clique, False otherwise
         """
-        self.graph.remove_edge(node1, node2)
+        clique_id = self.node_clique.get(node1)
+        return clique_id is not None and node1 != node2 and clique_id == self.node_clique.get(node2)
+
+    def clique_of(self, node):
+        """
+        Get the members of the clique of a node
+
+        params:
+            node: the index of the node
+        returns:
+            the set of members including the node, or an empty tuple if the node is in no clique
+        """
+        clique_id = self.node_clique.get(node)
+        return self.cliques[clique_id] if clique_id is not None else ()
 
     def clear_edges(self):
         """ Remove all edges from the graph """
-        self.graph.remove_edges_from(self.graph.edges())
+        self.version += 1
+        self.graph.remove_edges_from(list(self.graph.edges()))
+        self._reset_edge_ids()
+        self._reset_cliques()
 
     def clear_graph(self):
         """ Clear all nodes and edges from the graph """
+        self.version += 1
         self.graph.clear()
+        self._reset_edge_ids()
+        self._reset_cliques()
+
+    def set_kind(self, directed=False, weighted=False, multigraph=False, weigh=None):
+        """
+        Change the kind of the graph, keeping its nodes, cliques and edges
+
+        Undirected edges keep the direction they are stored with, edges collapsing on the same node pair
+        keep the lightest weight, and edges are weighed with weigh when weights are enabled
+
+        params:
+            directed: True for a directed graph
+            weighted: True for a weighted graph
+            multigraph: True to allow parallel edges
+            weigh: function giving the weight of an edge from its two nodes when weights are enabled,
+            the same one used for new edges, or None to give every edge DEFAULT_WEIGHT
+        """
+        self.version += 1
+        if weighted and not self.weighted and weigh is not None:
+            edges = [(u, v, weigh(u, v)) for (u, v, _) in self.iter_edges()]
+        else:
+            edges = [(u, v, self.edge_weight(edge_id)) for (u, v, edge_id) in self.iter_edges()]
+        edges.sort(key=lambda edge: edge[2])
+        nodes = self.get_nodes()
+
+        self.directed, self.weighted, self.multigraph = directed, weighted, multigraph
+        self.graph = GRAPH_CLASSES[(directed, multigraph)]()
+        self.graph.add_nodes_from(nodes)
+        self._reset_edge_ids()
+        self.add_edges(edges)
+
+    def key(self, node1, node2):
+        """
+        Get the key of an edge, ordered for a directed graph and canonical otherwise
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        returns:
+            a (node, node) tuple
+        """
+        return (node1, node2) if self.directed else edge_key(node1, node2)
+
+    def edge_id(self, node1, node2):
+        """
+        Get the ID of an edge
+
+        Edge IDs are small integers shared by every overlay and the weight array,
+        they are recycled once the edge is removed
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        returns:
+            the ID of the edge, the lightest one between parallel edges, if it exists, otherwise None
+        """
+        if not self.multigraph:
+            return self.edge_ids.get(self.key(node1, node2))
+        if not self.graph.has_edge(node1, node2):
+            return None
+        return min(self.graph[node1][node2], key=self.edge_weight)
+
+    def edge_weight(self, edge_id):
+        """
+        Get the weight of an edge
+
+        params:
+            edge_id: the ID of the edge
+        returns:
+            the weight of the edge, DEFAULT_WEIGHT if the graph is not weighted
+        """
+        return self.weights[edge_id] if self.weighted else DEFAULT_WEIGHT
+
+    def set_weight(self, edge_id, weight):
+        """
+        Change the weight of an edge of a weighted graph
+
+        params:
+            edge_id: the ID of the edge
+            weight: the new weight
+        raises:
+            ValueError: if the weight is negative
+        """
+        self.version += 1
+        if weight < 0:
+            raise ValueError(f"negative weight {weight} for edge {edge_id}")
+        self.weights[edge_id] = weight
+
+    def weight(self, node1, node2):
+        """
+        Get the weight of the lightest edge going from a node to another
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        returns:
+            the weight, DEFAULT_WEIGHT for an edge implied by a clique, or None if the nodes are not linked
+        """
+        if self.in_same_clique(node1, node2):
+            return DEFAULT_WEIGHT
+        edge_id = self.edge_id(node1, node2)
+        return self.edge_weight(edge_id) if edge_id is not None else None
+
+    def iter_edges(self):
+        """
+        Iterate over all edges with their ID
+
+        returns:
+            an iterator of (node1, node2, edge_id) tuples
+        """
+        if self.multigraph:
+            return iter(self.graph.edges(keys=True))
+        return ((u, v, edge_id) for (u, v), edge_id in self.edge_ids.items())
+
+    def overlay(self, name):
+        """
+        Get an edge overlay, creating it if needed
+
+        Overlays registered here are kept in sync with edge removals
+
+        params:
+            name: the name of the overlay
+        returns:
+            the EdgeOverlay registered under this name
+        """
+        if name not in self.overlays:
+            self.overlays[name] = EdgeOverlay()
+        return self.overlays[name]
+
+    def cached(self, algorithm, params, compute):
+        """
+        Get the result of an algorithm from the result cache, computing it if the graph changed since
+
+        Cached results are shared between callers, they are read-only: see result_cache.freeze
+
+        params:
+            algorithm: the name of the algorithm
+            params: hashable tuple of the parameters of the run
+            compute: a function without arguments running the algorithm on the current graph
+        returns:
+            the read-only result of the algorithm
+        """
+        return self.results.get_or_compute((algorithm, params, self.version), compute)
 
     def get_nodes(self):
         """
@@ -67,13 +527,37 @@ class GraphNetX:
 
     def get_edges(self):
         """
-        Get a list of all edges in the graph
+        Get a list of all explicit edges in the graph, edges implied by cliques are not listed
 
         returns:
-            a list of tuples representing edges
+            a list of tuples representing edges, parallel edges are listed once each
         """
         return list(self.graph.edges())
 
+    def adjacent_pairs(self):
+        """
+        Get the pairs of nodes linked by at least one explicit edge, in any direction
+
+        returns:
+            a list of (node1, node2) tuples, one per pair
+        """
+        if not self.directed and not self.multigraph:
+            return self.get_edges()
+        return list({edge_key(u, v) for (u, v) in self.graph.edges()})
+
+    def explicit_neighbors(self, node):
+        """
+        Get the nodes linked to a node by an explicit edge in any direction
+
+        params:
+            node: the index of the node
+        returns:
+            an iterable over the indices of the adjacent nodes, each listed once
+        """
+        if self.directed:
+            return set(self.graph.successors(node)).union(self.graph.predecessors(node))
+        return self.graph.neighbors(node)
+
     def has_node(self, node):
         """
         Check if a node exists in the graph
@@ -95,7 +579,7 @@ class GraphNetX:
         returns:
             True if the edge exists, False otherwise
         """
-        return self.graph.has_edge(node1, node2)
+        return self.graph.has_edge(node1, node2) or self.in_same_clique(node1, node2)
 
     def degree(self, node):
         """
@@ -107,19 +591,23 @@ class GraphNetX:
             the degree of the node if it exists, otherwise None
         """
         if self.graph.has_node(node):
-            return self.graph.degree(node)
+            return self.graph.degree(node) + max(len(self.clique_of(node)) - 1, 0)
         return None
 
     def generate_graph(self):
         """ Generate a random graph """
+        self.version += 1
         self.graph.clear()
-        self.graph = nx.gnm_random_graph(n=randint(7, 15), m=0)
+        self._reset_edge_ids()
+        self._reset_cliques()
+        self.graph.add_nodes_from(range(randint(7, 15)))
 
     def bfs(self, start_node):
         """
         Perform a breadth-first search starting from a node
 
-        Breadth-first search explores all neighbors of a node before moving deeper
+        Breadth-first search explores all neighbors of a node before moving deeper.
+        The result is cached until the graph changes
 
         params:
             start_node: the index of the node to start the search from
@@ -127,16 +615,21 @@ class GraphNetX:
             order: a list representing the order of visited nodes
             parents: a dictionary mapping each node to its parent in the search tree
         """
+        return self.cached("bfs", (start_node,), lambda: self._bfs(start_node))
+
+    def _bfs(self, start_node):
+        """ Breadth-first search behind bfs, without the result cache """
         visited = {start_node}
         order = []
         parents = {start_node: None}
         queue = deque([start_node])
+        pending = {}
 
         while queue:
             node = queue.popleft()
             order.append(node)
 
-            for neighbor in self.graph.neighbors(node):
+            for neighbor in self._traversal_neighbors(node, pending):
                 if neighbor not in visited:
                     visited.add(neighbor)
                     parents[neighbor] = node
@@ -148,7 +641,10 @@ class GraphNetX:
         """
         Perform a depth-first search starting from a node
 
-        Depth-first search explores as far as possible along a branch before backtracking
+        Depth-first search explores as far as possible along a branch before backtracking.
+        An explicit stack of neighbor iterators is used so that long paths, as found in large cliques,
+        do not hit the recursion limit.
+        The result is cached until the graph changes
 
         params:
             start_node: the index of the node to start the search from
@@ -156,19 +652,161 @@ class GraphNetX:
             order: a list representing the order of visited nodes
             parents: a dictionary mapping each node to its parent in the search tree
         """
-        visited = set()
+        return self.cached("dfs", (start_node,), lambda: self._dfs(start_node))
+
+    def _dfs(self, start_node):
+        """ Depth-first search behind dfs, without the result cache """
+        visited = {start_node}
+        order = [start_node]
         parents = {start_node: None}
-        order = self.__dfs_recursive(start_node, visited, parents)
+        pending = {}
+        stack = [(start_node, self._traversal_neighbors(start_node, pending))]
+
+        while stack:
+            node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    parents[neighbor] = node
+                    order.append(neighbor)
+                    stack.append((neighbor, self._traversal_neighbors(neighbor, pending)))
+                    break
+            else:
+                stack.pop()
+
         return order, parents
 
-    def __dfs_recursive(self, node, visited, parents):
-        """ Helper method for recursive depth-first search """
-        visited.add(node)
-        order = [node]
+    def dijkstra(self, start_node, end_node=None):
+        """
+        Compute the lightest paths from a node with Dijkstra's algorithm
+
+        Each reached node is kept once in an indexed heap whose priority is lowered in place.
+        Edges implied by cliques weigh DEFAULT_WEIGHT, so a clique only needs to be expanded
+        from the first of its members to be settled.
+        The result is cached until the graph changes
+
+        params:
+            start_node: the index of the node to start the search from
+            end_node: the index of a node at which the search can stop, or None to reach every node
+        returns:
+            distances: a dictionary mapping each reached node to the weight of its lightest path
+            parents: a dictionary mapping each reached node to its parent in the shortest path tree
+        """
+        return self.cached("dijkstra", (start_node, end_node), lambda: self._dijkstra(start_node, end_node))
+
+    def _dijkstra(self, start_node, end_node=None):
+        """ Dijkstra's algorithm behind dijkstra, without the result cache """
+        distances = {start_node: 0.0}
+        parents = {start_node: None}
+        settled = set()
+        pending = {}
+        heap = IndexedHeap()
+        heap.push(start_node, 0.0)
+
+        while heap:
+            node, distance = heap.pop()
+            settled.add(node)
+            if node == end_node:
+                break
+
+            explicit = ((neighbor, self.weight(node, neighbor)) for neighbor in self.graph.neighbors(node))
+            implied = ((member, DEFAULT_WEIGHT) for member in self.drain_clique(node, pending))
+            for neighbor, weight in chain(explicit, implied):
+                candidate = distance + weight
+                if neighbor not in settled and candidate < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = candidate
+                    parents[neighbor] = node
+                    heap.push(neighbor, candidate)
 
-        for neighbor in self.graph.neighbors(node):
-            if neighbor not in visited:
-                parents[neighbor] = node
-                order.extend(self.__dfs_recursive(neighbor, visited, parents))
+        return distances, parents
 
-        return order
+    def _traversal_neighbors(self, node, pending):
+        """
+        Iterate over the neighbors of a node during a traversal
+
+        Explicit neighbors come first, lightest edges first in a weighted graph.
+        The members of a clique are handed out once per traversal: pending keeps, for each clique,
+        the members that were not handed out yet, so a traversal stays linear in the clique size
+        """
+        explicit = self.graph.neighbors(node)
+        if self.weighted:
+            explicit = sorted(explicit, key=lambda neighbor: self.weight(node, neighbor))
+        return chain(explicit, self.drain_clique(node, pending))
+
+    def drain_clique(self, node, pending):
+        """
+        Yield the members of the clique of a node that were not handed out yet during a search
+
+        A search only needs to expand a clique from the first member it reaches,
+        this keeps the search linear in the clique size instead of quadratic
+
+        params:
+            node: the index of the node
+            pending: dictionary shared by the whole search, mapping each clique to its members not handed out yet
+        returns:
+            an iterator over the indices of the members, the node itself included if it was not handed out
+        """
+        clique_id = self.node_clique.get(node)
+        if clique_id is None:
+            return
+        if clique_id not in pending:
+            pending[clique_id] = set(self.cliques[clique_id])
+        members = pending[clique_id]
+        while members:
+            yield members.pop()
+
+    def _adjacent(self, node1, node2):
+        """ Check if two nodes are linked by an explicit edge in any direction """
+        return self.graph.has_edge(node1, node2) or (self.directed and self.graph.has_edge(node2, node1))
+
+    def _allocate_edge_id(self, weight):
+        """ Reuse a freed edge ID, or allocate a new one, and record the weight of the edge """
+        if self._free_edge_ids:
+            edge_id = self._free_edge_ids.pop()
+        else:
+            edge_id = self._next_edge_id
+            self._next_edge_id += 1
+
+        if self.weighted:
+            if edge_id == len(self.weights):
+                self.weights.append(weight)
+            else:
+                self.weights[edge_id] = weight
+        return edge_id
+
+    def _release_edge_id(self, edge_id):
+        """ Free the ID of a removed edge and unflag it in every overlay """
+        for overlay in self.overlays.values():
+            overlay.discard(edge_id)
+        self._free_edge_ids.append(edge_id)
+
+    def _release_incident_edges(self, nodes):
+        """ Free the IDs of every explicit edge touching a group of nodes, before the nodes are removed """
+        if self.multigraph:
+            edges = self.graph.edges(nodes, keys=True)
+            if self.directed:
+                edges = chain(edges, self.graph.in_edges(nodes, keys=True))
+            for edge_id in dict.fromkeys(edge_id for (_, _, edge_id) in edges):
+                self._release_edge_id(edge_id)
+            return
+
+        edges = self.graph.edges(nodes)
+        if self.directed:
+            edges = chain(edges, self.graph.in_edges(nodes))
+        for key in dict.fromkeys(self.key(u, v) for (u, v) in edges):
+            self._release_edge_id(self.edge_ids.pop(key))
+
+    def _reset_cliques(self):
+        """ Forget every clique """
+        self.cliques.clear()
+        self.node_clique.clear()
+        self.clique_ids.clear()
+
+    def _reset_edge_ids(self):
+        """ Forget every edge ID and clear every overlay """
+        self.edge_ids.clear()
+        self.weights = array("d")
+        self._free_edge_ids.clear()
+        self._next_edge_id = 0
+        for overlay in self.overlays.values():
+            overlay.clear()
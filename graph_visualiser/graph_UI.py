@@ -1,12 +1,35 @@
+import math
+from collections import Counter
+from itertools import islice
+
 from PyQt6.QtWidgets import QFrame
-from PyQt6.QtGui import QColor, QPainter, QMouseEvent, QPen, QKeyEvent
-from PyQt6.QtCore import Qt, QPoint, QTimer
+from PyQt6.QtGui import QColor, QPainter, QMouseEvent, QPen, QKeyEvent, QPolygonF, QWheelEvent
+from PyQt6.QtCore import Qt, QPointF, QTimer
+
+from graph import edge_key
+from graph_logic import GraphLogic, NODE_RADIUS
+
 
-from graph_logic import GraphLogic
+EDGE_OVERLAY_COLORS = [
+    ("bridges", "red"),
+    ("visited", "orange"),
+]
+PARALLEL_EDGE_SPACING = 16
+ARROW_SIZE = 18
+WEIGHT_LABEL_OFFSET = 14
+ZOOM_STEP = 1.15
+MIN_ZOOM = 0.05
+MAX_ZOOM = 5.0
 
 
 class InteractionArea(QFrame):
-    """ Interaction area for managing and visualizing graph operations """
+    """
+    Interaction area for managing and visualizing graph operations
+
+    The graph lives in world coordinates, the view transform maps them to the widget:
+    widget = world * zoom + pan. The mouse wheel zooms around the cursor, dragging with the middle button pans
+    and Ctrl + 0 resets the view. The world box of the graph, where new nodes are placed, follows the visible area
+    """
     def __init__(self):
         """
         Initialize the interaction area
@@ -18,9 +41,12 @@ class InteractionArea(QFrame):
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
         self.link_node_value = False
-        self.parents = dict()
 
-        self.graph = GraphLogic(width=600, height=400)
+        self.graph = GraphLogic()
+
+        self.zoom = 1.0
+        self.pan = QPointF(0, 0)
+        self.pan_origin = None
 
         self.timer = QTimer(self)
 
@@ -38,7 +64,11 @@ class InteractionArea(QFrame):
         params:
             event: QMouseEvent containing click details
         """
-        clicked_position = event.pos()
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self.pan_origin = event.position() - self.pan
+            return
+
+        clicked_position = self.to_world(event.position())
         if event.button() == Qt.MouseButton.LeftButton:
             self.handle_left_click(clicked_position)
         elif event.button() == Qt.MouseButton.RightButton:
@@ -53,7 +83,7 @@ class InteractionArea(QFrame):
         If a node is clicked, start linking. Otherwise, add a new node
 
         params:
-            position: QPoint of the click position
+            position: (x, y) tuple of the click position
         """
         clicked_circle = self.graph.find_circle(position)
 
@@ -74,7 +104,7 @@ class InteractionArea(QFrame):
         Removes the node at the clicked position if it exists
 
         params:
-            position: QPoint of the click position
+            position: (x, y) tuple of the click position
         """
         clicked_circle = self.graph.find_circle(position)
         if clicked_circle is not None:
@@ -84,28 +114,37 @@ class InteractionArea(QFrame):
 
     def mouseMoveEvent(self, event: QMouseEvent):
         """
-        Handle mouse move events for dynamic edge drawing
+        Handle mouse move events for dynamic edge drawing and panning
 
-        Updates the temporary edge position while dragging the mouse
+        Updates the temporary edge position while dragging the mouse, or moves the view while the middle button is held
 
         params:
             event: QMouseEvent containing the current mouse position
         """
-        if self.is_drawing_edge and self.edge_start_node is not None:
-            self.current_mouse_position = event.pos()
+        if self.pan_origin is not None:
+            self.pan = event.position() - self.pan_origin
+            self._fit_world()
+            self.update()
+
+        elif self.is_drawing_edge and self.edge_start_node is not None:
+            self.current_mouse_position = self.to_world(event.position())
             self.update()
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         """
         Handle mouse release events to finalize node selection or edge creation
 
-        Creates or removes an edge between nodes, or toggles selection for a single node
+        Creates or removes an edge between nodes, or toggles selection for a single node.
+        In a multigraph a parallel edge is created, and an edge is removed only if Shift is held
 
         params:
             event: QMouseEvent containing the release position
         """
-        if event.button() == Qt.MouseButton.LeftButton and self.is_drawing_edge:
-            end_node = self.graph.find_circle(event.pos())
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self.pan_origin = None
+
+        elif event.button() == Qt.MouseButton.LeftButton and self.is_drawing_edge:
+            end_node = self.graph.find_circle(self.to_world(event.position()))
 
             if end_node == self.edge_start_node:
                 if end_node in self.graph.selected_circle:
@@ -114,7 +153,12 @@ class InteractionArea(QFrame):
                     self.graph.selected_circle.add(end_node)
 
             elif end_node is not None and end_node != self.edge_start_node:
-                if self.graph.graph.has_edge(self.edge_start_node, end_node):
+                if self.graph.graph.multigraph:
+                    remove = event.modifiers() & Qt.KeyboardModifier.ShiftModifier
+                else:
+                    remove = self.graph.graph.has_edge(self.edge_start_node, end_node)
+
+                if remove:
                     self.graph.remove_edge(self.edge_start_node, end_node)
                 else :
                     self.graph.add_edge(self.edge_start_node, end_node)
@@ -128,9 +172,9 @@ class InteractionArea(QFrame):
     """ Keyboard Event functions """
     def keyPressEvent(self, event: QKeyEvent):
         """
-        Handle key press events for graph selection
+        Handle key press events for graph selection and the view
 
-        Allows selecting or deselecting all nodes with Ctrl + A
+        Allows selecting or deselecting all nodes with Ctrl + A, and resetting the view with Ctrl + 0
 
         params:
             event: QKeyEvent containing key press details
@@ -143,6 +187,63 @@ class InteractionArea(QFrame):
 
             self.update()
 
+        elif event.modifiers() == Qt.KeyboardModifier.ControlModifier and event.key() == Qt.Key.Key_0:
+            self.zoom = 1.0
+            self.pan = QPointF(0, 0)
+            self._fit_world()
+            self.update()
+
+    """ View functions """
+    def wheelEvent(self, event: QWheelEvent):
+        """
+        Zoom the view around the cursor
+
+        params:
+            event: QWheelEvent containing the scroll amount and the cursor position
+        """
+        steps = event.angleDelta().y() / 120
+        zoom = min(max(self.zoom * ZOOM_STEP ** steps, MIN_ZOOM), MAX_ZOOM)
+
+        cursor = event.position()
+        self.pan = cursor - (cursor - self.pan) * (zoom / self.zoom)
+        self.zoom = zoom
+        self._fit_world()
+        self.update()
+
+    def resizeEvent(self, event):
+        """
+        Fit the world box to the new size of the widget
+
+        params:
+            event: the resize event
+        """
+        super().resizeEvent(event)
+        self._fit_world()
+
+    def to_world(self, point):
+        """
+        Map a widget position to world coordinates
+
+        params:
+            point: QPointF in widget coordinates
+        returns:
+            (x, y) tuple of integer world coordinates
+        """
+        world = (point - self.pan) / self.zoom
+        return round(world.x()), round(world.y())
+
+    def visible_box(self):
+        """
+        Get the part of the world shown by the widget
+
+        returns:
+            (min_x, min_y, max_x, max_y) tuple of integer world coordinates, rounded outwards
+        """
+        top_left = (QPointF(0, 0) - self.pan) / self.zoom
+        bottom_right = (QPointF(self.width(), self.height()) - self.pan) / self.zoom
+        return (math.floor(top_left.x()), math.floor(top_left.y()),
+                math.ceil(bottom_right.x()), math.ceil(bottom_right.y()))
+
     """ GUI function """
     def paintEvent(self, event):
         """
@@ -156,8 +257,12 @@ class InteractionArea(QFrame):
         super().paintEvent(event)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.translate(self.pan)
+        painter.scale(self.zoom, self.zoom)
 
         self.draw_edges(painter)
+        self.draw_cliques(painter)
         self.draw_temporary_edge(painter)
         self.draw_nodes(painter)
 
@@ -165,7 +270,8 @@ class InteractionArea(QFrame):
         """
         Draw all nodes in the graph
 
-        Colors nodes based on their state: current, visited, selected, or default
+        Colors nodes based on their state: current, marked, visited (with its color class once colored),
+        selected, or default. Only the nodes in view are drawn
 
         params:
             painter: QPainter used for drawing
@@ -174,26 +280,34 @@ class InteractionArea(QFrame):
         pen.setWidth(8)
         painter.setPen(pen)
 
-        current_node_id = None
-        if 0 <= self.graph.current_index < len(self.graph.nodes_order):
-            current_node_id = self.graph.nodes_order[self.graph.current_index]
+        current_step = self.graph.current_step()
+        current_node_id = current_step[0] if current_step is not None else None
 
-        for node_id, circle_center in self.graph.circles.items():
+        min_x, min_y, max_x, max_y = self.visible_box()
+        circles = self.graph.circles
+        for node_id in circles.in_box(min_x - NODE_RADIUS, min_y - NODE_RADIUS,
+                                      max_x + NODE_RADIUS, max_y + NODE_RADIUS):
+            x, y = circles[node_id]
             if node_id == current_node_id:
                 painter.setBrush(QColor("cyan"))
+            elif node_id in self.graph.marked_nodes:
+                painter.setBrush(QColor("red"))
+            elif node_id in self.graph.visited_nodes and node_id in self.graph.node_colors:
+                painter.setBrush(self._color_class(self.graph.node_colors[node_id]))
             elif node_id in self.graph.visited_nodes:
                 painter.setBrush(QColor("yellow"))
             elif node_id in self.graph.selected_circle:
                 painter.setBrush(QColor("yellow"))
             else:
                 painter.setBrush(QColor("green"))
-            painter.drawEllipse(circle_center, 30, 30)
+            painter.drawEllipse(QPointF(x, y), NODE_RADIUS, NODE_RADIUS)
 
     def draw_edges(self, painter):
         """
         Draw all edges in the graph
 
-        Colors edges orange if visited, black otherwise
+        Colors edges with the color of the first overlay flagging them (orange if visited), black otherwise.
+        Edges sharing the same two nodes, in a multigraph or in both directions, are drawn side by side
 
         params:
             painter: QPainter used for drawing
@@ -201,36 +315,94 @@ class InteractionArea(QFrame):
         pen = QPen()
         pen.setWidth(8)
 
-        for (start, end) in self.graph.graph.get_edges():
-            pen.setColor(
-                QColor("orange") if (start, end) in self.graph.visited_edges
-                                or (end, start) in self.graph.visited_edges
-                else QColor("black")
-            )
+        graph = self.graph.graph
+        overlays = [(graph.overlay(name), QColor(color)) for name, color in EDGE_OVERLAY_COLORS]
+        default_color = QColor("black")
+
+        shared = None
+        if graph.directed or graph.multigraph:
+            shared = Counter(edge_key(u, v) for (u, v, _) in graph.iter_edges())
+            drawn = Counter()
+
+        for (start, end, edge_id) in graph.iter_edges():
+            color = default_color
+            for overlay, overlay_color in overlays:
+                if edge_id in overlay:
+                    color = overlay_color
+                    break
+            pen.setColor(color)
             painter.setPen(pen)
 
-            self.draw_edge(painter, start, end)
+            offset = 0
+            if shared is not None:
+                key = edge_key(start, end)
+                offset = (drawn[key] - (shared[key] - 1) / 2) * PARALLEL_EDGE_SPACING
+                offset = offset if (start, end) == key else -offset
+                drawn[key] += 1
+
+            weight = graph.edge_weight(edge_id) if graph.weighted else None
+            self.draw_edge(painter, start, end, offset, weight)
 
-    def draw_edge(self, painter, start, end):
+    def draw_cliques(self, painter):
+        """
+        Draw the cliques of the graph
+
+        A clique is drawn as a translucent hull around its members instead of one line per edge,
+        then the implied edges used by the current traversal are drawn in orange
+
+        params:
+            painter: QPainter used for drawing
+        """
+        painter.setPen(QPen(QColor("black"), 3, Qt.PenStyle.DashLine))
+        painter.setBrush(QColor(0, 0, 0, 60))
+
+        for members in self.graph.graph.cliques.values():
+            hull = self._convex_hull([self.graph.circles[member] for member in members])
+            painter.drawPolygon(QPolygonF(hull))
+
+        pen = QPen(QColor("orange"))
+        pen.setWidth(8)
+        painter.setPen(pen)
+
+        for node_id, parent_id in islice(self.graph.steps, max(self.graph.current_index, 0)):
+            if parent_id is not None and self.graph.graph.in_same_clique(parent_id, node_id):
+                self.draw_edge(painter, parent_id, node_id)
+
+    def draw_edge(self, painter, start, end, offset=0, weight=None):
         """
         Draw a single edge between two nodes
 
-        Adjusts edge endpoints to avoid overlapping with node boundaries
+        Adjusts edge endpoints to avoid overlapping with node boundaries,
+        ends the edge with an arrow in a directed graph and labels it with its weight if given
 
         params:
             painter: QPainter used for drawing
             start: the index of the starting node
             end: the index of the ending node
+            offset: the distance between the edge and the line joining the centers of the nodes
+            weight: the weight to write next to the edge, or None
         """
-        start_pos = self.graph.circles[start]
-        end_pos = self.graph.circles[end]
+        start_pos = QPointF(*self.graph.circles[start])
+        end_pos = QPointF(*self.graph.circles[end])
         direction = end_pos - start_pos
         length = (direction.x() ** 2 + direction.y() ** 2) ** 0.5
 
         if length != 0:
-            unit_direction = QPoint(int(direction.x() / length), int(direction.y() / length))
-            radius = 30
-            painter.drawLine(start_pos + unit_direction * radius, end_pos - unit_direction * radius)
+            unit_direction = direction / length
+            normal = QPointF(-unit_direction.y(), unit_direction.x())
+            line_start = start_pos + unit_direction * NODE_RADIUS + normal * offset
+            line_end = end_pos - unit_direction * NODE_RADIUS + normal * offset
+            painter.drawLine(line_start, line_end)
+
+            if self.graph.graph.directed:
+                base = line_end - unit_direction * ARROW_SIZE
+                painter.setBrush(painter.pen().color())
+                painter.drawPolygon(QPolygonF([line_end, base + normal * (ARROW_SIZE / 2),
+                                               base - normal * (ARROW_SIZE / 2)]))
+
+            if weight is not None:
+                label = (line_start + line_end) / 2 + normal * WEIGHT_LABEL_OFFSET
+                painter.drawText(label, f"{weight:g}")
 
     def draw_temporary_edge(self, painter):
         """
@@ -244,43 +416,90 @@ class InteractionArea(QFrame):
         if self.is_drawing_edge and self.edge_start_node is not None and self.current_mouse_position is not None:
             pen = QPen(QColor("blue"), 3, Qt.PenStyle.DashLine)
             painter.setPen(pen)
-            painter.drawLine(self.graph.circles[self.edge_start_node], self.current_mouse_position)
+            painter.drawLine(QPointF(*self.graph.circles[self.edge_start_node]), QPointF(*self.current_mouse_position))
+
+    @staticmethod
+    def _color_class(color):
+        """
+        Get the fill color of a color class, hues are spread with the golden angle
+
+        params:
+            color: the index of the color class
+        returns:
+            a QColor
+        """
+        return QColor.fromHsv(int(color * 137.508) % 360, 170, 240)
+
+    @staticmethod
+    def _convex_hull(points):
+        """
+        Compute the convex hull of a list of points with Andrew's monotone chain
+
+        params:
+            points: list of (x, y) tuples
+        returns:
+            the list of the hull vertices as QPointF, in counter-clockwise order
+        """
+        points = sorted(set(points))
+        if len(points) <= 2:
+            return [QPointF(x, y) for (x, y) in points]
+
+        def cross(o, a, b):
+            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+        lower, upper = [], []
+        for point in points:
+            while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0:
+                lower.pop()
+            lower.append(point)
+        for point in reversed(points):
+            while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0:
+                upper.pop()
+            upper.append(point)
+
+        return [QPointF(x, y) for (x, y) in lower[:-1] + upper[:-1]]
 
     """ Algorithm visualizer functions """
-    def visualize_algorithm(self, nodes_order):
+    def visualize_algorithm(self, steps):
         """
-        Visualize the execution of a graph traversal algorithm
+        Visualize the execution of a graph algorithm
 
-        Highlights nodes and edges step-by-step based on the provided traversal order
+        Highlights nodes and edges step-by-step based on the provided steps
 
         params:
-            nodes_order: list of node IDs representing the traversal order
+            steps: list of (node, parent) steps as produced by the algorithms module
         """
         self.graph.current_index = 0
-        self.graph.nodes_order = nodes_order
+        self.graph.steps = steps
 
         self.graph.visited_nodes = set()
-        self.graph.visited_edges = set()
+        self.graph.visited_edges.clear()
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_node_color)
-        self.timer.start(1000)
+        self.resume_visualization()
+
+    def resume_visualization(self):
+        """
+        Start stepping through the traversal order from the current index
+
+        Used to start a new visualization or to continue one restored from a session
+        """
+        self.timer.stop()
+        if self.graph.current_step() is not None:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.update_node_color)
+            self.timer.start(1000)
 
     def update_node_color(self):
         """
         Update the color of the currently visited node and its connecting edge
 
-        Highlights the current node as visited and colors the edge connecting it to its parent
-        Increments the traversal index to move to the next node in the traversal order
-        Stops the visualization once all nodes are visited
+        Highlights the node of the current step as visited and colors the edge connecting it to its parent
+        Increments the step index to move to the next step
+        Stops the visualization once all steps are visited
         """
-        if 0 <= self.graph.current_index < len(self.graph.nodes_order):
-            node_id = self.graph.nodes_order[self.graph.current_index]
-            self.graph.visited_nodes.add(node_id)
-
-            parent_id = self.parents.get(node_id, None)
-            if parent_id is not None and self.graph.graph.has_edge(parent_id, node_id):
-                self.graph.visited_edges.add((parent_id, node_id))
+        current_step = self.graph.current_step()
+        if current_step is not None:
+            self.graph.visit_step(*current_step)
 
             self.update()
             self.graph.current_index += 1
@@ -292,13 +511,14 @@ class InteractionArea(QFrame):
         """
         Reset the graph visualization state
 
-        Clears all visual and logical states associated with the traversal, including visited nodes,
-        visited edges, and the traversal index. Restores the graph to its default state
+        Clears all visual and logical states associated with the visualization, including visited nodes,
+        visited edges, results such as colors, and the step index. Restores the graph to its default state
         """
         self.timer.stop()
-        self.graph.current_index = -1
         self.graph.selected_circle.clear()
-        self.graph.visited_nodes.clear()
-        self.graph.visited_edges.clear()
-        self.parents.clear()
+        self.graph.clear_visualization()
         self.update()
+
+    def _fit_world(self):
+        """ Set the world box of the graph to the visible area """
+        self.graph.set_world(*self.visible_box())
@@ -1,12 +1,18 @@
+import math
 import random
-from PyQt6.QtCore import QPoint
-from graph import GraphNetX
+from itertools import combinations, permutations
+from graph import GraphNetX, edge_key
+from geometry import PositionStore
+from crossings import SegmentIndex, count_crossings
+from analysis import GraphAnalysis
+from id_allocator import IdAllocator
+from algorithms import articulation_points, dsatur_coloring, kruskal, prim, topological_sort, traversal_steps
 
 
 NODE_RADIUS = 30
 MIN_SPACING = 100
 EDGE_MAX = 3
-INTERPOLATION_STEPS = 100
+IMPLICIT_CLIQUE_MIN = 16
 INTERPOLATION_RADIUS = 40
 MIN_X = 40
 MIN_Y = 40
@@ -15,28 +21,48 @@ DEFAULT_HEIGHT = 400
 
 
 class GraphLogic:
-    """ Logic for managing graph nodes, edges, and algorithms. """
-    def __init__(self, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT):
+    """
+    Logic for managing graph nodes, edges, and algorithms.
+
+    Positions are world coordinates, independent of the widget displaying them. New nodes are placed in the world box,
+    from (min_x_, min_y_) to (min_x_ + width_, min_y_ + height_) minus a margin, which the UI keeps on the visible area:
+    the box follows the view, nodes left outside of it stay where they are
+    """
+    def __init__(self, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, reuse_node_ids=False,
+                 directed=False, weighted=False, multigraph=False):
         """
         Initialize the graph logic
 
         params:
-            width: the width of the interaction area
-            height: the height of the interaction area
-        """
+            width: the initial width of the world box, which starts at (0, 0)
+            height: the initial height of the world box
+            reuse_node_ids: True to give the IDs of removed nodes to new nodes
+            directed: True for a directed graph
+            weighted: True for a weighted graph, new edges weigh their length
+            multigraph: True to allow parallel edges
+        """
+        self.min_x_ = 0
+        self.min_y_ = 0
         self.width_ = width
         self.height_ = height
 
         self.link_node_value = False
-        self.circles = {}
+        self.avoid_crossings_value = False
+        self.circles = PositionStore(cell_size=MIN_SPACING)
+        self.generation = 0
+        self.node_ids = IdAllocator(reuse_ids=reuse_node_ids)
         self.selected_circle = set()
 
-        self.graph = GraphNetX()
+        self.graph = GraphNetX(directed=directed, weighted=weighted, multigraph=multigraph)
+        self.analysis = GraphAnalysis(self.graph)
 
         self.current_index = -1
-        self.nodes_order = []
+        self.steps = []
         self.visited_nodes = set()
-        self.visited_edges = set()
+        self.visited_edges = self.graph.overlay("visited")
+        self.bridge_edges = self.graph.overlay("bridges")
+        self.marked_nodes = set()
+        self.node_colors = {}
 
     """ Graph logic functions """
     def add_circle(self, position):
@@ -44,12 +70,40 @@ class GraphLogic:
         Add a node to the graph at the given position if it is valid
 
         params:
-            position: QPoint representing the position of the node
+            position: (x, y) tuple representing the position of the node
         """
-        new_id = self._generate_node_id()
         if not self.is_circle_too_close(position):
+            new_id = self._generate_node_id()
             self.circles[new_id] = position
             self.graph.add_node(new_id)
+            self.analysis.add_node(new_id)
+
+    def add_circles(self, positions):
+        """
+        Add several nodes at once, validating all the positions in a single pass
+
+        Positions are checked against the existing nodes and the previously accepted positions of the batch
+
+        params:
+            positions: iterable of (x, y) tuples representing the positions of the nodes
+        returns:
+            a list with, for each position, the index of the added node or None if the position was rejected
+        """
+        new_ids = []
+
+        for position in positions:
+            if self.is_circle_too_close(position):
+                new_ids.append(None)
+                continue
+            new_id = self._generate_node_id()
+            self.circles[new_id] = position
+            new_ids.append(new_id)
+
+        added_ids = [new_id for new_id in new_ids if new_id is not None]
+        self.graph.add_nodes(added_ids)
+        for new_id in added_ids:
+            self.analysis.add_node(new_id)
+        return new_ids
 
     def link_new_circle(self):
         """
@@ -58,21 +112,47 @@ class GraphLogic:
         This function works only if the linking mode is enabled
         """
         if self.link_node_value and len(self.circles) > 1:
-            nodes = sorted(self.circles.keys())
+            nodes = self.node_ids.last(2)
             if len(nodes) >= 2:
-                node1, node2 = nodes[-2], nodes[-1]
+                node1, node2 = nodes
                 self.add_edge(node1, node2)
 
     def add_edge(self, node1, node2):
         """
-        Add an edge between two nodes
+        Add an edge between two nodes, weighing its length if the graph is weighted
 
         params:
             node1: the index of the first node
             node2: the index of the second node
         """
-        if not self.graph.has_edge(node1, node2):
-            self.graph.add_edge(node1, node2)
+        self.add_edges([(node1, node2)])
+
+    def add_edges(self, edges):
+        """
+        Add several edges at once, self-loops, existing edges of a simple graph and edges with an end
+        that is not a circle are ignored
+
+        params:
+            edges: iterable of (node1, node2) tuples, or (node1, node2, weight) tuples for a weighted graph.
+            Edges without a weight weigh their length
+        returns:
+            the list of node pairs that were not adjacent yet
+        """
+        circles = self.circles
+        edges = [edge for edge in edges if edge[0] in circles and edge[1] in circles]
+        new_pairs = self.graph.add_edges(self._with_weights(edges))
+        self.analysis.add_edges(new_pairs)
+        return new_pairs
+
+    def remove_edges(self, edges):
+        """
+        Remove several edges at once, missing edges are ignored
+
+        params:
+            edges: iterable of (node1, node2) tuples
+        """
+        removed_edges = self.graph.remove_edges(edges)
+        self.analysis.remove_edges(removed_edges)
 
     def remove_edge(self, node1, node2):
         """
@@ -82,8 +162,8 @@ class GraphLogic:
             node1: the index of the first node
             node2: the index of the second node
         """
-        if self.graph.has_edge(node1, node2):
-            self.graph.remove_edge(node1, node2)
+        if self.graph.has_edge(node1, node2) and self.graph.remove_edge(node1, node2):
+            self.analysis.remove_edge(node1, node2)
 
     def remove_circle(self, node):
         """
@@ -92,9 +172,30 @@ class GraphLogic:
         params:
             node: the index of the node
         """
-        if node in self.circles:
+        self.remove_circles([node])
+
+    def remove_circles(self, nodes):
+        """
+        Remove several circles and all their associated edges at once
+
+        params:
+            nodes: iterable of the indices of the nodes
+        """
+        nodes = [node for node in dict.fromkeys(nodes) if node in self.circles]
+        self._leave_cliques(nodes)
+
+        removed = set()
+        neighbors = []
+        for node in nodes:
+            neighbors.append([neighbor for neighbor in self.graph.explicit_neighbors(node) if neighbor not in removed])
+            removed.add(node)
+
+        self.graph.remove_nodes(nodes)
+
+        for node, node_neighbors in zip(nodes, neighbors):
             del self.circles[node]
-            self.graph.del_node(node)
+            self.node_ids.release(node)
+            self.analysis.remove_node(node, node_neighbors)
             self.selected_circle.discard(node)
 
     def find_circle(self, position):
@@ -102,28 +203,25 @@ class GraphLogic:
         Find the circle at a given position
 
         params:
-            position: QPoint representing the position to check
+            position: (x, y) tuple representing the position to check
         returns:
-            the index of the node if found, otherwise None
+            the index of the closest node if found, otherwise None
         """
-        for node_id, circle_center in self.circles.items():
-            if (circle_center - position).manhattanLength() <= NODE_RADIUS:
-                return node_id
-        return None
+        return self.circles.nearest(position[0], position[1], NODE_RADIUS)
 
     def is_circle_too_close(self, position):
         """
         Check if a position is too close to existing circles or out of bounds
 
         params:
-            position: QPoint representing the position to check
+            position: (x, y) tuple representing the position to check
         returns:
             True if the position is invalid, False otherwise
         """
-        if not (MIN_X <= position.x() <= self.width_ - MIN_X) or not (MIN_Y <= position.y() <= self.height_ - MIN_Y):
+        if self._is_out_of_bounds(position):
             return True
 
-        return any((circle_center - position).manhattanLength() < MIN_SPACING for circle_center in self.circles.values())
+        return self.circles.any_closer_than(position[0], position[1], MIN_SPACING)
 
     def generate_position(self):
         """
@@ -137,33 +235,56 @@ class GraphLogic:
             - Return the first valid position or None if no position is found
 
         returns:
-            QPoint representing the generated position, or None if no position is valid
+            (x, y) tuple representing the generated position, or None if no position is valid
         """
         spacing = MIN_SPACING
         max_attempts = 500
         attempts = 0
+        min_x, min_y, max_x, max_y = self._placement_box()
+        if min_x > max_x or min_y > max_y:
+            return None
 
         while attempts < max_attempts:
-            x = random.randint(MIN_X, self.width_ - MIN_X)
-            y = random.randint(MIN_Y, self.height_ - MIN_Y)
+            x = random.randint(min_x, max_x)
+            y = random.randint(min_y, max_y)
 
-            new_position = QPoint(x, y)
-            if not any((circle_center - new_position).manhattanLength() < spacing
-                       for circle_center in self.circles.values()):
-                return new_position
+            if not self.circles.any_closer_than(x, y, spacing):
+                return x, y
             attempts += 1
 
-        for y in range(MIN_X, self.height_ - MIN_X, spacing):
-            for x in range(MIN_Y, self.width_ - MIN_Y, spacing):
-                scan_position = QPoint(x, y)
-                if not any((circle_center - scan_position).manhattanLength() < spacing
-                           for circle_center in self.circles.values()):
-                    return scan_position
+        for y in range(min_y, max_y + 1, spacing):
+            for x in range(min_x, max_x + 1, spacing):
+                if not self.circles.any_closer_than(x, y, spacing):
+                    return x, y
 
         return None
 
-    def generate_graph(self):
-        """ Generate a random graph by adding nodes and linking them """
+    def set_world(self, min_x, min_y, max_x, max_y):
+        """
+        Move the world box where new nodes are placed, it may have negative coordinates
+
+        The nodes outside of the new box are kept. The spatial indexes are unbounded grids,
+        so no structure has to be rebuilt
+
+        params:
+            min_x: the left of the box
+            min_y: the top of the box
+            max_x: the right of the box
+            max_y: the bottom of the box
+        """
+        self.min_x_ = math.floor(min_x)
+        self.min_y_ = math.floor(min_y)
+        self.width_ = math.ceil(max_x) - self.min_x_
+        self.height_ = math.ceil(max_y) - self.min_y_
+
+    def generate_graph(self, avoid_crossings=None):
+        """
+        Generate a random graph by adding nodes and linking them, the nodes left without edges are removed
+
+        params:
+            avoid_crossings: True to reject edges crossing existing ones when linking,
+            None to use the crossing-avoidance mode
+        """
         self.clear_circles()
         self.graph.generate_graph()
 
@@ -171,30 +292,33 @@ class GraphLogic:
             position = self.generate_position()
             if position is not None:
                 self.circles[node] = position
-            else:
-                continue
+                self.node_ids.reserve(node)
 
-        self.random_link_selected_nodes(nodes=list(self.circles.keys()))
+        self.graph.remove_nodes([node for node in self.graph.get_nodes() if node not in self.circles])
+        self.analysis.reset(self.graph.get_nodes())
 
-        nodes_to_remove = [node for node in self.circles.keys() if self._degree(node) == 0]
-        for node in nodes_to_remove:
-            self.remove_circle(node)
+        self.random_link_selected_nodes(nodes=list(self.circles.keys()), avoid_crossings=avoid_crossings)
 
-        nodes_to_remove = [node for node in self.circles.keys() if self._degree(node) == 0]
-        for node in nodes_to_remove:
-            self.remove_circle(node)
+        self.remove_circles([node for node in self.circles.keys() if self._degree(node) == 0])
 
     """ Link edges functions """
     def full_link_selected_nodes(self):
-        """ Link all selected nodes to others """
+        """
+        Link all selected nodes to others
+
+        From IMPLICIT_CLIQUE_MIN selected nodes, the edges are not materialized:
+        the selection is recorded as a clique whose edges are implied
+        """
         if len(self.selected_circle) > 1:
             nodes = list(self.selected_circle)
             self.clear_edges_from(nodes)
-            for i in range(len(nodes)):
-                for j in range(i + 1, len(nodes)):
-                    self.add_edge(nodes[i], nodes[j])
+            if len(nodes) >= IMPLICIT_CLIQUE_MIN:
+                self.graph.add_clique(nodes)
+                self.analysis.add_clique(nodes)
+            else:
+                self.add_edges(permutations(nodes, 2) if self.graph.directed else combinations(nodes, 2))
 
-    def random_link_selected_nodes(self, nodes=None):
+    def random_link_selected_nodes(self, nodes=None, avoid_crossings=None):
         """
         Create random links between the selected nodes
 
@@ -206,12 +330,17 @@ class GraphLogic:
                 - Identify potential nodes to link that are not already connected,
                 ensuring they also meet the degree constraint and do not create overlapping edges
                 - Shuffle the list of possible nodes to randomize connections
-                - Add edges up to the maximum allowed degree for the current node
+                - Add edges up to the maximum allowed degree for the current node,
+                skipping the ones that would cross an existing edge when crossings are avoided
             - synchronize the adjacency map
 
         params:
             nodes: list of node to link randomly
+            avoid_crossings: True to reject edges crossing existing ones, None to use the crossing-avoidance mode
         """
+        if avoid_crossings is None:
+            avoid_crossings = self.avoid_crossings_value
+
         if nodes is None:
             if len(self.selected_circle) <= 1:
                 return
@@ -219,11 +348,13 @@ class GraphLogic:
             nodes = list(self.selected_circle)
 
         self.clear_edges_from(nodes)
-        self.random_linking_process(nodes)
+        self.random_linking_process(nodes, avoid_crossings)
 
-    def random_linking_process(self, nodes):
-        """ Randomly link nodes """
+    def random_linking_process(self, nodes, avoid_crossings=False):
+        """ Randomly link nodes, optionally without crossing the existing edges """
         adjacency = self._build_adjacency()
+        new_edges = []
+        segments = self._segment_index() if avoid_crossings else None
 
         for node in nodes:
             current_links = len(adjacency[node])
@@ -237,11 +368,22 @@ class GraphLogic:
                         possible_nodes.append(other_node)
 
             random.shuffle(possible_nodes)
-            links_to_add = min(EDGE_MAX - current_links, len(possible_nodes))
-            for i in range(links_to_add):
-                self.add_edge(node, possible_nodes[i])
-                adjacency[node].add(possible_nodes[i])
-                adjacency[possible_nodes[i]].add(node)
+            links_to_add = EDGE_MAX - current_links
+            for other_node in possible_nodes:
+                if links_to_add == 0:
+                    break
+                if segments is not None:
+                    start, end = self.circles[node], self.circles[other_node]
+                    if segments.crosses(start, end):
+                        continue
+                    segments.add(edge_key(node, other_node), start, end)
+
+                new_edges.append((node, other_node))
+                adjacency[node].add(other_node)
+                adjacency[other_node].add(node)
+                links_to_add -= 1
+
+        self.add_edges(new_edges)
 
     def is_node_on_line_with_radius(self, start_node, end_node):
         """
@@ -253,26 +395,44 @@ class GraphLogic:
         returns:
             True if a node lies on the line, False otherwise
         """
-        start_pos = self.circles[start_node]
-        end_pos = self.circles[end_node]
-
-        for i in range(INTERPOLATION_STEPS + 1):
-            t = i / INTERPOLATION_STEPS
-            x = int(start_pos.x() * (1 - t) + end_pos.x() * t)
-            y = int(start_pos.y() * (1 - t) + end_pos.y() * t)
-            interpolated_point = QPoint(x, y)
-
-            for node_id, circle_center in self.circles.items():
-                if node_id not in {start_node, end_node}:
-                    if (circle_center - interpolated_point).manhattanLength() < INTERPOLATION_RADIUS:
-                        return True
-
-        return False
+        return self.circles.any_near_segment(self.circles[start_node], self.circles[end_node],
+                                             INTERPOLATION_RADIUS, exclude=(start_node, end_node))
 
     def link_nodes(self):
         """ Toggle automatic linking mode """
         self.link_node_value = not self.link_node_value
 
+    def avoid_crossings(self):
+        """ Toggle crossing-avoidance mode for random linking """
+        self.avoid_crossings_value = not self.avoid_crossings_value
+
+    def set_graph_kind(self, directed=False, weighted=False, multigraph=False):
+        """
+        Change the kind of the graph, keeping the nodes and converting the edges
+
+        When weights are enabled, the existing edges weigh their length.
+        The current visualization is discarded
+
+        params:
+            directed: True for a directed graph
+            weighted: True for a weighted graph
+            multigraph: True to allow parallel edges
+        """
+        self.graph.set_kind(directed=directed, weighted=weighted, multigraph=multigraph, weigh=self._edge_length)
+        self.analysis.reset(self.graph.get_nodes())
+        self.clear_visualization()
+
+    def crossing_count(self):
+        """
+        Count the pairs of crossing edges, edges implied by cliques are not drawn and not counted
+
+        The count is output-sensitive for edges spread over the area, see count_crossings
+
+        returns:
+            the number of crossing pairs of edges
+        """
+        return count_crossings([(self.circles[u], self.circles[v]) for (u, v, _) in self.graph.iter_edges()])
+
     """ Clear functions """
     def clear_edges_from(self, nodes):
         """
@@ -281,42 +441,144 @@ class GraphLogic:
         params:
             nodes: list of node whose edges should be removed
         """
-        edges_to_remove = []
-        for (u, v) in self.graph.get_edges():
-            if u in nodes or v in nodes:
-                edges_to_remove.append((u, v))
-
-        for (u, v) in edges_to_remove:
-            self.graph.remove_edge(u, v)
+        self._leave_cliques(nodes)
+        self.remove_edges(self.graph.incident_edges(nodes))
 
     def clear_edges(self):
         """ Clear all edges from the graph """
         self.graph.clear_edges()
+        self.analysis.reset(self.graph.get_nodes())
 
     def clear_circles(self):
-        """ Clear all circles from the graph """
+        """ Clear all circles from the graph, node IDs restart from 0 in a new generation """
+        self.generation += 1
         self.circles.clear()
+        self.node_ids.clear()
         self.selected_circle.clear()
         self.graph.clear_graph()
+        self.analysis.reset()
+        self.clear_visualization()
 
+    def clear_visualization(self):
+        """ Forget the steps of the current visualization and the results it displays """
         self.current_index = -1
-        self.nodes_order.clear()
-        self.visited_nodes.clear()
+        self.steps = []
+        self.visited_nodes = set()
         self.visited_edges.clear()
+        self.bridge_edges.clear()
+        self.marked_nodes = set()
+        self.node_colors = {}
+
+    """ Visualization steps """
+    def visit_step(self, node, parent):
+        """
+        Mark a step of the visualization as visited: its node, its parent and the edge between them
+
+        Algorithms ignoring directions may report an edge of a directed graph backwards
+
+        params:
+            node: the index of the visited node
+            parent: the index of the node it was reached from, or None
+        """
+        self.visited_nodes.add(node)
+        if parent is None:
+            return
+
+        self.visited_nodes.add(parent)
+        edge_id = self._edge_id_any_direction(parent, node)
+        if edge_id is not None:
+            self.visited_edges.add(edge_id)
+
+    def current_step(self):
+        """
+        Get the step of the visualization being displayed
+
+        returns:
+            the (node, parent) tuple of the step, or None if no visualization is running
+        """
+        if 0 <= self.current_index < len(self.steps):
+            return self.steps[self.current_index]
+        return None
 
     """ Visualized Dijsktra """
     def shortest_path(self, start_node, end_node):
         """
-        Find and visualize the shortest path between two nodes using Dijkstra's algorithm
+        Find the shortest path between two nodes using Dijkstra's algorithm
 
         Algorithm:
-            _
+            - Settle the nodes by increasing distance from the start node with an indexed heap,
+            relaxing the edges leaving each settled node with their weight
+            - Stop once the end node is settled
+            - Walk the parents back from the end node to rebuild the path
 
         params:
             start_node: the index of the starting node
             end_node: the index of the ending node
+        returns:
+            steps: the (node, parent) steps along the path, empty if the end node is unreachable
+            weight: the weight of the path, or None if the end node is unreachable
+        """
+        distances, parents = self.graph.dijkstra(start_node, end_node)
+        if end_node not in parents:
+            return [], None
+
+        path = [end_node]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return traversal_steps(path, parents), distances[end_node]
+
+    """ Visualized spanning trees """
+    def minimum_spanning_tree(self, algorithm="kruskal", start_node=None):
+        """
+        Find a minimum spanning forest, ignoring edge directions
+
+        params:
+            algorithm: "kruskal" or "prim"
+            start_node: the index of the node Prim's algorithm starts from, or None
+        returns:
+            steps: the (node, parent) steps adding the edges of the forest
+            weight: the total weight of the forest
+        """
+        if algorithm == "prim":
+            return self.graph.cached("prim", (start_node,), lambda: prim(self.graph, start_node))
+        return self.graph.cached("kruskal", (), lambda: kruskal(self.graph))
+
+    """ Visualized topological sort """
+    def topological_order(self):
+        """
+        Order the nodes of a directed acyclic graph so that every edge goes forward
+
+        returns:
+            steps: the (node, parent) steps in topological order
+            order: the list of node indices
+        raises:
+            ValueError: if the graph is undirected or has a cycle
+        """
+        return self.graph.cached("topological sort", (), lambda: topological_sort(self.graph))
+
+    """ Visualized articulation points """
+    def find_articulation_points(self):
+        """
+        Find and mark the articulation points and the bridges of the graph, ignoring edge directions
+
+        The articulation points are marked and the explicit bridges are flagged in the bridge overlay
+
+        returns:
+            steps: the (node, parent) steps of the depth-first search
+            points: the set of articulation points
+            bridges: the list of (parent, child) bridges
         """
-        pass
+        steps, points, bridges = self.graph.cached("articulation points", (), lambda: articulation_points(self.graph))
+
+        self.marked_nodes = set(points)
+        self.bridge_edges.clear()
+        for (u, v) in bridges:
+            edge_id = self._edge_id_any_direction(u, v)
+            if edge_id is not None:
+                self.bridge_edges.add(edge_id)
+
+        return steps, points, bridges
 
     """ Visualized coloration """
     def coloration(self):
@@ -325,9 +587,16 @@ class GraphLogic:
         Assigns colors to nodes such that no two adjacent nodes share the same color
 
         Algorithm:
-            _
+            - DSatur: repeatedly color the uncolored node with the most distinct colors among its neighbors,
+            ties broken by degree, with the smallest color unused by its neighbors
+
+        returns:
+            steps: the (node, None) steps in coloring order
+            colors: a dictionary mapping each node to its color, colors being numbered from 0
         """
-        pass
+        steps, colors = self.graph.cached("dsatur", (), lambda: dsatur_coloring(self.graph))
+        self.node_colors = colors
+        return steps, colors
 
     """ Private helpers """
     def _generate_node_id(self):
@@ -337,9 +606,92 @@ class GraphLogic:
         returns:
             the next available integer index for a node
         """
-        if not self.circles:
-            return 0
-        return max(self.circles.keys()) + 1
+        return self.node_ids.allocate()
+
+    def _is_out_of_bounds(self, position):
+        """
+        Check if a position is outside of the area where nodes can be placed
+
+        params:
+            position: (x, y) tuple representing the position to check
+        returns:
+            True if the position is out of bounds, False otherwise
+        """
+        x, y = position
+        min_x, min_y, max_x, max_y = self._placement_box()
+        return not (min_x <= x <= max_x) or not (min_y <= y <= max_y)
+
+    def _placement_box(self):
+        """
+        Get the part of the world box where nodes can be placed, inside its margins
+
+        returns:
+            (min_x, min_y, max_x, max_y) tuple of integer world coordinates, empty if the box is too small
+        """
+        return (self.min_x_ + MIN_X, self.min_y_ + MIN_Y,
+                self.min_x_ + self.width_ - MIN_X, self.min_y_ + self.height_ - MIN_Y)
+
+    def _leave_cliques(self, nodes):
+        """
+        Take nodes out of their cliques, removing the implied edges between them and the other members
+
+        params:
+            nodes: list of node indices
+        """
+        self.analysis.leave_cliques(self.graph.leave_cliques(nodes))
+
+    def _edge_length(self, node1, node2):
+        """
+        Get the length of the segment between two nodes, used as the default weight of an edge
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        returns:
+            the euclidean distance between the nodes, rounded to an integer
+        """
+        return float(round(math.dist(self.circles[node1], self.circles[node2])))
+
+    def _with_weights(self, edges):
+        """
+        Give their length as weight to the edges without one when the graph is weighted
+
+        params:
+            edges: iterable of (node1, node2) or (node1, node2, weight) tuples
+        returns:
+            an iterable of edges accepted by GraphNetX.add_edges
+        """
+        if not self.graph.weighted:
+            return edges
+        return [edge if len(edge) > 2 else (edge[0], edge[1], self._edge_length(edge[0], edge[1]))
+                for edge in edges]
+
+    def _edge_id_any_direction(self, node1, node2):
+        """
+        Get the ID of an explicit edge between two nodes, trying both directions in a directed graph
+
+        params:
+            node1: the index of the first node
+            node2: the index of the second node
+        returns:
+            the ID of the edge if it exists, otherwise None
+        """
+        edge_id = self.graph.edge_id(node1, node2)
+        if edge_id is None and self.graph.directed:
+            edge_id = self.graph.edge_id(node2, node1)
+        return edge_id
+
+    def _segment_index(self):
+        """
+        Build a segment index of the explicit edges of the graph
+
+        returns:
+            a SegmentIndex containing one segment per edge
+        """
+        segments = SegmentIndex(cell_size=MIN_SPACING)
+        for (u, v, _) in self.graph.iter_edges():
+            segments.add(edge_key(u, v), self.circles[u], self.circles[v])
+        return segments
 
     def _degree(self, node):
         """
@@ -350,11 +702,7 @@ class GraphLogic:
         returns:
             the degree of the node
         """
-        deg = 0
-        for (u, v) in self.graph.get_edges():
-            if u == node or v == node:
-                deg += 1
-        return deg
+        return self.analysis.degrees.get(node, 0)
 
     def _build_adjacency(self):
         """
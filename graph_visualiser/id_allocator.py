@@ -0,0 +1,106 @@
+class IdAllocator:
+    """
+    Allocator of integer IDs
+
+    IDs come from a monotonic counter, optionally recycled through a free-list,
+    and the live IDs are kept in insertion order
+    """
+    def __init__(self, reuse_ids=False):
+        """
+        Initialize an empty allocator
+
+        params:
+            reuse_ids: True to hand out released IDs again before new ones
+        """
+        self.reuse_ids = reuse_ids
+        self.next_id = 0
+        self.order = {}
+        self.free_ids = []
+        self._free_set = set()
+
+    def allocate(self):
+        """
+        Allocate a new ID
+
+        returns:
+            a released ID if reuse is enabled and one is available, otherwise the next counter value
+        """
+        if self.free_ids:
+            new_id = self.free_ids.pop()
+            self._free_set.discard(new_id)
+        else:
+            new_id = self.next_id
+            self.next_id += 1
+
+        self.order[new_id] = None
+        return new_id
+
+    def reserve(self, new_id):
+        """
+        Register an ID chosen by the caller
+
+        params:
+            new_id: the ID to mark as used
+        """
+        if new_id in self._free_set:
+            self._free_set.discard(new_id)
+            self.free_ids.remove(new_id)
+        self.next_id = max(self.next_id, new_id + 1)
+        self.order[new_id] = None
+
+    def restore(self, live_ids, next_id):
+        """
+        Replace the state of the allocator, the free-list is emptied
+
+        params:
+            live_ids: the live IDs in insertion order
+            next_id: the next value of the counter
+        """
+        self.clear()
+        self.order = dict.fromkeys(live_ids)
+        self.next_id = next_id
+
+    def release(self, old_id):
+        """
+        Release an ID
+
+        params:
+            old_id: the ID that is no longer used
+        """
+        if old_id in self.order:
+            del self.order[old_id]
+            if self.reuse_ids:
+                self.free_ids.append(old_id)
+                self._free_set.add(old_id)
+
+    def clear(self):
+        """ Release every ID and restart the counter """
+        self.next_id = 0
+        self.order.clear()
+        self.free_ids.clear()
+        self._free_set.clear()
+
+    def last(self, count=1):
+        """
+        Get the most recently allocated live IDs
+
+        params:
+            count: the number of IDs to return
+        returns:
+            a list of at most count IDs, oldest first
+        """
+        latest = []
+        for live_id in reversed(self.order):
+            if len(latest) == count:
+                break
+            latest.append(live_id)
+        return latest[::-1]
+
+    def __contains__(self, live_id):
+        return live_id in self.order
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __len__(self):
+        return len(self.order)
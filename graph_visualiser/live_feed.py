@@ -0,0 +1,286 @@
+import json
+import math
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtNetwork import QLocalServer
+
+from graph import edge_key
+
+
+FRAME_INTERVAL = 16
+MAX_LINE_LENGTH = 1 << 20
+
+
+class EventBatch:
+    """
+    Coalesced graph events received during one frame
+
+    Only the net effect of the events is kept: the last operation on a node or an edge wins,
+    and removing a node cancels the pending operations on its edges
+    """
+    def __init__(self, directed=False):
+        """
+        Initialize an empty batch
+
+        params:
+            directed: True to tell the edges source -> target and target -> source apart
+        """
+        self.directed = directed
+        self.node_ops = {}
+        self.edge_ops = {}
+        self.edge_weights = {}
+        self.node_edges = {}
+
+    def push(self, event):
+        """
+        Add an event to the batch, the batch is left untouched if the event is invalid
+
+        params:
+            event: dictionary with an "op" key among add_node, remove_node, add_edge, remove_edge,
+            an "id" key for node events, optional "x" and "y" keys for add_node,
+            "source" and "target" keys for edge events and an optional "weight" key for add_edge
+        raises:
+            ValueError: if the operation is unknown, a coordinate is not finite or the weight is not a non-negative number
+            KeyError: if a key of the operation is missing
+            TypeError: if the event is not a dictionary or a node ID is not hashable
+        """
+        op = event["op"]
+        if op == "add_node":
+            position = (_coordinate(event["x"]), _coordinate(event["y"])) if "x" in event and "y" in event else None
+            replaced = self.node_ops.get(event["id"], ("add", None))[0] != "add"
+            self.node_ops[event["id"]] = ("replace" if replaced else "add", position)
+
+        elif op == "remove_node":
+            self.node_ops[event["id"]] = ("remove", None)
+            for key in self.node_edges.pop(event["id"], ()):
+                self.edge_ops.pop(key, None)
+
+        elif op in ("add_edge", "remove_edge"):
+            source, target = event["source"], event["target"]
+            key = (source, target) if self.directed else edge_key(source, target)
+            weight = float(event["weight"]) if op == "add_edge" and "weight" in event else None
+            if weight is not None and not weight >= 0:
+                raise ValueError(f"invalid weight {weight}")
+
+            self.edge_ops[key] = op
+            self.edge_weights.pop(key, None)
+            if weight is not None:
+                self.edge_weights[key] = weight
+            for node in key:
+                self.node_edges.setdefault(node, set()).add(key)
+
+        else:
+            raise ValueError(f"unknown operation: {op}")
+
+    def __len__(self):
+        return len(self.node_ops) + len(self.edge_ops)
+
+
+def _coordinate(value):
+    """
+    Convert the coordinate of an event to an integer
+
+    params:
+        value: the coordinate, a number or a numeric string
+    returns:
+        the coordinate truncated to an integer
+    raises:
+        ValueError: if the coordinate is not a finite number
+    """
+    coordinate = float(value)
+    if not math.isfinite(coordinate):
+        raise ValueError(f"invalid coordinate {value}")
+    return int(coordinate)
+
+
+class LiveFeed:
+    """
+    Applies coalesced batches of external events to a GraphLogic
+
+    External node IDs are mapped to the IDs allocated by the GraphLogic. Mappings are dropped when their node
+    is removed from the GraphLogic, by the user or by a clear, so external IDs never point to someone else's node
+    """
+    def __init__(self, graph_logic):
+        """
+        Initialize the feed
+
+        params:
+            graph_logic: the GraphLogic receiving the updates
+        """
+        self.graph_logic = graph_logic
+        self.local_ids = {}
+        self.generation = graph_logic.generation
+        self.batch = EventBatch(graph_logic.graph.directed)
+
+    def push(self, event):
+        """
+        Queue an event until the next flush
+
+        params:
+            event: dictionary describing the event, see EventBatch.push
+        """
+        self.batch.push(event)
+
+    def push_line(self, line):
+        """
+        Queue the events of one line of newline-delimited JSON
+
+        Each event is validated on its own, so a malformed event does not discard the rest of its list
+
+        params:
+            line: the bytes of a JSON event or of a JSON list of events
+        returns:
+            the number of queued events
+        """
+        try:
+            events = json.loads(line)
+        except ValueError:
+            return 0
+
+        queued = 0
+        for event in events if isinstance(events, list) else [events]:
+            try:
+                self.push(event)
+            except (ValueError, KeyError, TypeError):
+                continue
+            queued += 1
+        return queued
+
+    def flush(self):
+        """
+        Apply the queued events as one bulk update
+
+        Edges are removed first, then nodes are removed, added and linked.
+        Nodes without a position, or whose position is rejected, get a generated position
+
+        returns:
+            True if any event was applied, False if the batch was empty
+        """
+        if not self.batch:
+            return False
+
+        batch, self.batch = self.batch, EventBatch(self.graph_logic.graph.directed)
+        graph = self.graph_logic
+        self._forget_removed_nodes()
+
+        graph.remove_edges(edge for _, edge in
+                           self._local_edges(key for key, op in batch.edge_ops.items() if op == "remove_edge"))
+
+        removed = [node for node, (op, _) in batch.node_ops.items() if op != "add"]
+        graph.remove_circles(self.local_ids.pop(node) for node in removed if node in self.local_ids)
+
+        added = [(node, position) for node, (op, position) in batch.node_ops.items()
+                 if op != "remove" and node not in self.local_ids]
+        new_ids = graph.add_circles(position for (_, position) in added if position is not None)
+        new_ids = iter(new_ids)
+        for node, position in added:
+            local_id = next(new_ids) if position is not None else None
+            if local_id is None:
+                generated = graph.generate_position()
+                local_id = graph.add_circles([generated])[0] if generated is not None else None
+            if local_id is not None:
+                self.local_ids[node] = local_id
+
+        added_edges = self._local_edges(key for key, op in batch.edge_ops.items() if op == "add_edge")
+        graph.add_edges(edge + ((batch.edge_weights[key],) if key in batch.edge_weights else ())
+                        for key, edge in added_edges)
+        return True
+
+    def _forget_removed_nodes(self):
+        """ Drop the mappings of the nodes removed from the GraphLogic since the last flush """
+        if self.generation != self.graph_logic.generation:
+            self.generation = self.graph_logic.generation
+            self.local_ids.clear()
+            return
+
+        circles = self.graph_logic.circles
+        for node in [node for node, local_id in self.local_ids.items() if local_id not in circles]:
+            del self.local_ids[node]
+
+    def _local_edges(self, keys):
+        """ Translate external edges into (external key, local edge) pairs, dropping the ones with an unknown end """
+        return [((u, v), (self.local_ids[u], self.local_ids[v])) for (u, v) in keys
+                if u in self.local_ids and v in self.local_ids]
+
+
+class LiveFeedServer(QObject):
+    """
+    Local socket server feeding a LiveFeed
+
+    Clients send newline-delimited JSON, each line being an event or a list of events.
+    Events are coalesced and applied at most once per frame, followed by a single repaint.
+    A client sending a line longer than MAX_LINE_LENGTH bytes is disconnected
+    """
+    def __init__(self, interaction_area, name):
+        """
+        Start listening on a local socket
+
+        params:
+            interaction_area: the InteractionArea displaying the graph
+            name: the name of the local socket
+        raises:
+            OSError: if the server cannot listen on the socket
+        """
+        super().__init__(interaction_area)
+        self.interaction_area = interaction_area
+        self.feed = LiveFeed(interaction_area.graph)
+        self.buffers = {}
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_INTERVAL)
+        self.frame_timer.timeout.connect(self.flush)
+
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.accept_connections)
+        QLocalServer.removeServer(name)
+        if not self.server.listen(name):
+            raise OSError(self.server.errorString())
+
+    def accept_connections(self):
+        """ Register every pending client connection """
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(lambda socket=socket: self.read_events(socket))
+            socket.disconnected.connect(lambda socket=socket: self.close_connection(socket))
+
+    def read_events(self, socket):
+        """
+        Parse the complete lines received from a client and queue their events
+
+        Malformed lines and events are ignored, a client whose line exceeds MAX_LINE_LENGTH is disconnected
+
+        params:
+            socket: the QLocalSocket with data available
+        """
+        if socket not in self.buffers:
+            return
+
+        *lines, pending = (self.buffers[socket] + bytes(socket.readAll())).split(b"\n")
+        if len(pending) > MAX_LINE_LENGTH or any(len(line) > MAX_LINE_LENGTH for line in lines):
+            self.buffers.pop(socket)
+            socket.abort()
+            return
+        self.buffers[socket] = pending
+
+        for line in lines:
+            self.feed.push_line(line)
+
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def close_connection(self, socket):
+        """
+        Forget a disconnected client
+
+        params:
+            socket: the disconnected QLocalSocket
+        """
+        self.buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def flush(self):
+        """ Apply the events of the frame and repaint once """
+        if self.feed.flush():
+            self.interaction_area.update()
@@ -0,0 +1,131 @@
+class IndexedHeap:
+    """
+    Indexed d-ary min-heap
+
+    Each item is stored at most once and its position in the heap is tracked, so its priority can be
+    changed in place instead of pushing a duplicate entry. A larger arity gives a shallower tree,
+    which makes priority decreases cheaper at the cost of slightly slower pops
+    """
+    def __init__(self, arity=4):
+        """
+        Initialize an empty heap
+
+        params:
+            arity: the number of children of each heap node
+        """
+        self.arity = arity
+        self.items = []
+        self.priorities = []
+        self.positions = {}
+
+    def push(self, item, priority):
+        """
+        Insert an item, or change its priority if it is already in the heap
+
+        params:
+            item: a hashable item
+            priority: the priority of the item, smallest first
+        """
+        index = self.positions.get(item)
+        if index is None:
+            index = len(self.items)
+            self.items.append(item)
+            self.priorities.append(priority)
+            self.positions[item] = index
+            self._sift_up(index)
+            return
+
+        old_priority = self.priorities[index]
+        self.priorities[index] = priority
+        if priority < old_priority:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def pop(self):
+        """
+        Remove the item with the smallest priority
+
+        returns:
+            an (item, priority) tuple
+        raises:
+            IndexError: if the heap is empty
+        """
+        if not self.items:
+            raise IndexError("pop from an empty heap")
+
+        item, priority = self.items[0], self.priorities[0]
+        last_item, last_priority = self.items.pop(), self.priorities.pop()
+        del self.positions[item]
+        if self.items:
+            self.items[0], self.priorities[0] = last_item, last_priority
+            self.positions[last_item] = 0
+            self._sift_down(0)
+        return item, priority
+
+    def peek(self):
+        """
+        Get the item with the smallest priority without removing it
+
+        returns:
+            an (item, priority) tuple
+        raises:
+            IndexError: if the heap is empty
+        """
+        if not self.items:
+            raise IndexError("peek at an empty heap")
+        return self.items[0], self.priorities[0]
+
+    def priority(self, item):
+        """
+        Get the priority of an item
+
+        params:
+            item: an item of the heap
+        returns:
+            the priority of the item
+        """
+        return self.priorities[self.positions[item]]
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __len__(self):
+        return len(self.items)
+
+    def _sift_up(self, index):
+        """ Move an entry towards the root until its parent has a smaller or equal priority """
+        items, priorities, positions = self.items, self.priorities, self.positions
+        item, priority = items[index], priorities[index]
+
+        while index > 0:
+            parent = (index - 1) // self.arity
+            if not priority < priorities[parent]:
+                break
+            items[index], priorities[index] = items[parent], priorities[parent]
+            positions[items[index]] = index
+            index = parent
+
+        items[index], priorities[index] = item, priority
+        positions[item] = index
+
+    def _sift_down(self, index):
+        """ Move an entry towards the leaves until its children have a larger or equal priority """
+        items, priorities, positions = self.items, self.priorities, self.positions
+        item, priority = items[index], priorities[index]
+        size = len(items)
+
+        while True:
+            first = index * self.arity + 1
+            if first >= size:
+                break
+            last = min(first + self.arity, size)
+            child = min(range(first, last), key=priorities.__getitem__)
+            if not priorities[child] < priority:
+                break
+            items[index], priorities[index] = items[child], priorities[child]
+            positions[items[index]] = index
+            index = child
+
+        items[index], priorities[index] = item, priority
+        positions[item] = index
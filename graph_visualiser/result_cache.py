@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from types import MappingProxyType
+
+
+def freeze(value):
+    """
+    Make an algorithm result read-only so that it can be shared by every caller
+
+    params:
+        value: the result, a container or a tuple of containers
+    returns:
+        the result with its lists turned into tuples, its sets into frozensets and its dictionaries
+        into read-only mappings, recursively through tuples
+    """
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, dict):
+        return MappingProxyType(value)
+    return value
+
+
+class ResultCache:
+    """
+    Bounded least-recently-used cache of algorithm results
+
+    Results are keyed by (algorithm, parameters, graph version): any mutation of the graph bumps its version,
+    so stale results are never hit again and are eventually evicted as new ones come in.
+    Cached results are shared between callers, they are frozen when stored so that no caller can alter them
+    """
+    def __init__(self, max_size=32):
+        """
+        Initialize an empty cache
+
+        params:
+            max_size: the number of results kept before the least recently used one is evicted
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Get a cached result, computing, freezing and storing it on a miss
+
+        params:
+            key: a hashable (algorithm, parameters, version) tuple
+            compute: a function without arguments returning the result
+        returns:
+            the frozen result
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        result = freeze(compute())
+        self.entries[key] = result
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """ Drop every cached result """
+        self.entries.clear()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
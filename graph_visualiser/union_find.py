@@ -0,0 +1,104 @@
+class UnionFind:
+    """ Disjoint-set forest with path compression and union by size """
+    def __init__(self, elements=()):
+        """
+        Initialize the forest with one singleton set per element
+
+        params:
+            elements: iterable of the initial elements
+        """
+        self.parent = {}
+        self.size = {}
+
+        for element in elements:
+            self.add(element)
+
+    def add(self, element):
+        """
+        Add an element as a singleton set if it is not already present
+
+        params:
+            element: the element to add
+        """
+        if element not in self.parent:
+            self.parent[element] = element
+            self.size[element] = 1
+
+    def reset(self, element):
+        """
+        Turn an element back into a singleton set
+
+        Only valid when every element of its set is reset as well, since other elements may point to it
+
+        params:
+            element: the element to reset
+        """
+        self.parent[element] = element
+        self.size[element] = 1
+
+    def discard(self, element):
+        """
+        Forget an element
+
+        Like reset, only valid while the whole set of the element is being rebuilt
+
+        params:
+            element: the element to forget
+        """
+        self.parent.pop(element, None)
+        self.size.pop(element, None)
+
+    def find(self, element):
+        """
+        Find the representative of the set containing an element
+
+        params:
+            element: the element to look up
+        returns:
+            the root element of its set
+        """
+        root = element
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        while self.parent[element] != root:
+            self.parent[element], element = root, self.parent[element]
+
+        return root
+
+    def union(self, element1, element2):
+        """
+        Merge the sets containing two elements
+
+        params:
+            element1: an element of the first set
+            element2: an element of the second set
+        returns:
+            the root of the merged set, or None if both elements were already in the same set
+        """
+        root1 = self.find(element1)
+        root2 = self.find(element2)
+        if root1 == root2:
+            return None
+
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+
+        self.parent[root2] = root1
+        self.size[root1] += self.size.pop(root2)
+        return root1
+
+    def connected(self, element1, element2):
+        """
+        Check if two elements are in the same set
+
+        params:
+            element1: the first element
+            element2: the second element
+        returns:
+            True if both elements share a root, False otherwise
+        """
+        return self.find(element1) == self.find(element2)
+
+    def __contains__(self, element):
+        return element in self.parent
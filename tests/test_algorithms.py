@@ -0,0 +1,142 @@
+import random
+import time
+from itertools import combinations
+
+import networkx as nx
+import pytest
+
+from algorithms import articulation_points, dsatur_coloring, kruskal, prim, topological_sort, traversal_steps
+from graph import GraphNetX
+
+
+def random_graph(seed):
+    """ Draw a random graph of a random kind, sometimes with a clique """
+    random.seed(seed)
+    graph = GraphNetX(*(random.random() < 0.5 for _ in range(3)))
+    node_count = random.randint(1, 40)
+    graph.add_nodes(range(node_count))
+    graph.add_edges((random.randrange(node_count), random.randrange(node_count), float(random.randint(0, 9)))
+                    for _ in range(random.randint(0, 2 * node_count)))
+    if random.random() < 0.5 and node_count > 6:
+        members = random.sample(range(node_count), random.randint(2, min(node_count, 12)))
+        graph.remove_edges([(u, v) for u in members for v in members])
+        graph.add_clique(members)
+    return graph
+
+
+def expanded(graph):
+    """ Build the graph with its clique edges materialized with NetworkX """
+    reference = nx.MultiDiGraph() if graph.directed else nx.MultiGraph()
+    reference.add_nodes_from(graph.get_nodes())
+    for (u, v, edge_id) in graph.iter_edges():
+        reference.add_edge(u, v, weight=graph.edge_weight(edge_id))
+    for members in graph.cliques.values():
+        for u, v in combinations(members, 2):
+            reference.add_edge(u, v, weight=1.0)
+            if graph.directed:
+                reference.add_edge(v, u, weight=1.0)
+    return reference
+
+
+def simple_undirected(reference):
+    """ Keep the lightest edge between each pair of nodes, ignoring directions """
+    simple = nx.Graph()
+    simple.add_nodes_from(reference)
+    for u, v, data in reference.edges(data=True):
+        if not simple.has_edge(u, v) or simple[u][v]["weight"] > data["weight"]:
+            simple.add_edge(u, v, weight=data["weight"])
+    return simple
+
+
+SEEDS = range(150)
+
+
+def test_traversal_steps():
+    assert traversal_steps([0, 2, 1], {0: None, 2: 0, 1: 2}) == [(0, None), (2, 0), (1, 2)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_spanning_forests_match_networkx(seed):
+    graph = random_graph(seed)
+    simple = simple_undirected(expanded(graph))
+    expected = nx.minimum_spanning_tree(simple).size(weight="weight")
+
+    steps, weight = kruskal(graph)
+    assert weight == pytest.approx(expected)
+    assert len(steps) == simple.number_of_nodes() - nx.number_connected_components(simple)
+
+    steps, weight = prim(graph, start_node=random.choice(graph.get_nodes()))
+    assert weight == pytest.approx(expected)
+    assert sorted(node for node, _ in steps) == sorted(graph.get_nodes())
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_articulation_points_and_bridges_match_networkx(seed):
+    graph = random_graph(seed)
+    reference = expanded(graph)
+    simple = simple_undirected(reference)
+
+    steps, points, bridges = articulation_points(graph)
+    assert points == set(nx.articulation_points(simple))
+    if graph.multigraph and not graph.directed:
+        expected = {frozenset(edge) for edge in nx.bridges(simple) if reference.number_of_edges(*edge) == 1}
+    else:
+        expected = {frozenset(edge) for edge in nx.bridges(simple)}
+    assert {frozenset(bridge) for bridge in bridges} == expected
+    assert sorted(node for node, _ in steps) == sorted(graph.get_nodes())
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_topological_sort(seed):
+    graph = random_graph(seed)
+    if not graph.directed:
+        with pytest.raises(ValueError):
+            topological_sort(graph)
+        return
+
+    reference = expanded(graph)
+    if not nx.is_directed_acyclic_graph(reference):
+        with pytest.raises(ValueError):
+            topological_sort(graph)
+        return
+
+    _, order = topological_sort(graph)
+    position = {node: index for index, node in enumerate(order)}
+    assert sorted(order) == sorted(graph.get_nodes())
+    assert all(position[u] < position[v] for u, v in reference.edges())
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_dsatur_colors_properly(seed):
+    graph = random_graph(seed)
+    simple = simple_undirected(expanded(graph))
+
+    steps, colors = dsatur_coloring(graph)
+    assert sorted(colors) == sorted(graph.get_nodes())
+    assert len(steps) == len(colors)
+    assert all(colors[u] != colors[v] for u, v in simple.edges())
+    for members in graph.cliques.values():
+        assert len({colors[member] for member in members}) == len(members)
+
+
+def test_dsatur_keeps_cliques_implicit():
+    graph = GraphNetX()
+    graph.add_nodes(range(30000))
+    graph.add_clique(range(20000))
+    graph.add_edges([(node, node + 20000) for node in range(10000)])
+
+    start = time.perf_counter()
+    _, colors = dsatur_coloring(graph)
+    assert time.perf_counter() - start < 30
+    assert len(set(colors[node] for node in range(20000))) == 20000
+    assert all(colors[node] != colors[node + 20000] for node in range(10000))
+
+
+def test_dijkstra_matches_networkx():
+    for seed in SEEDS:
+        graph = random_graph(seed)
+        start = random.choice(graph.get_nodes())
+        distances, parents = graph.dijkstra(start)
+        reference = nx.single_source_dijkstra_path_length(expanded(graph), start)
+        assert distances == pytest.approx(reference)
+        assert parents[start] is None
@@ -0,0 +1,93 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graph_logic import GraphLogic
+
+
+def reference_graph(graph_logic):
+    """ Build the underlying simple undirected graph with NetworkX """
+    reference = nx.Graph()
+    reference.add_nodes_from(graph_logic.graph.get_nodes())
+    reference.add_edges_from(graph_logic.graph.adjacent_pairs())
+    for members in graph_logic.graph.cliques.values():
+        reference.add_edges_from((u, v) for u in members for v in members if u != v)
+    return reference
+
+
+def assert_matches_reference(graph_logic):
+    analysis = graph_logic.analysis
+    reference = reference_graph(graph_logic)
+
+    assert analysis.component_count() == nx.number_connected_components(reference)
+    assert sorted(map(sorted, analysis.components())) == sorted(map(sorted, nx.connected_components(reference)))
+
+    stats = analysis.degree_stats()
+    assert stats["nodes"] == reference.number_of_nodes()
+    assert stats["edges"] == reference.number_of_edges()
+    degrees = [degree for _, degree in reference.degree()]
+    assert stats["histogram"] == {degree: degrees.count(degree) for degree in sorted(set(degrees))}
+
+    if analysis.bfs_root is not None:
+        distances, parents = analysis.bfs_tree()
+        assert distances == nx.single_source_shortest_path_length(reference, analysis.bfs_root)
+        for node, parent in parents.items():
+            if parent is not None:
+                assert reference.has_edge(node, parent)
+                assert distances[node] == distances[parent] + 1
+
+
+def build(node_count):
+    graph_logic = GraphLogic()
+    graph_logic.graph.add_nodes(range(node_count))
+    for node in range(node_count):
+        graph_logic.circles[node] = (node, node)
+        graph_logic.node_ids.reserve(node)
+    graph_logic.analysis.reset(range(node_count))
+    return graph_logic
+
+
+def test_empty_graph():
+    analysis = GraphLogic().analysis
+    assert analysis.component_count() == 0
+    assert analysis.degree_stats()["mean"] == 0.0
+    assert analysis.bfs_depth() is None
+
+
+def test_path_components_and_depth():
+    graph_logic = build(5)
+    graph_logic.add_edges([(0, 1), (1, 2), (3, 4)])
+    analysis = graph_logic.analysis
+    analysis.set_bfs_root(0)
+
+    assert analysis.component_count() == 2
+    assert analysis.connected(0, 2) and not analysis.connected(2, 3)
+    assert analysis.bfs_depth() == 2
+
+    graph_logic.remove_edge(1, 2)
+    assert analysis.component_count() == 3
+    assert analysis.bfs_depth() == 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_mutations_match_networkx(seed):
+    random.seed(seed)
+    graph_logic = build(40)
+    graph_logic.analysis.set_bfs_root(0)
+
+    for _ in range(300):
+        nodes = graph_logic.graph.get_nodes()
+        operation = random.random()
+        if operation < 0.5:
+            graph_logic.add_edges([(random.choice(nodes), random.choice(nodes))])
+        elif operation < 0.8:
+            edges = graph_logic.graph.get_edges()
+            if edges:
+                graph_logic.remove_edge(*random.choice(edges))
+        elif operation < 0.9 and len(nodes) > 2:
+            graph_logic.remove_circle(random.choice(nodes[1:]))
+        else:
+            graph_logic.selected_circle = set(random.sample(nodes, min(len(nodes), random.choice((4, 20)))))
+            graph_logic.full_link_selected_nodes()
+        assert_matches_reference(graph_logic)
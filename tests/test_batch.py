@@ -0,0 +1,13 @@
+from batch import COLUMNS, graph_statistics, run_chunk
+
+
+def test_rows_depend_only_on_the_seed_and_the_index():
+    assert graph_statistics(3, seed=7) == graph_statistics(3, seed=7)
+    assert run_chunk(2, 5, seed=7)["graph"] == [2, 3, 4]
+
+
+def test_generated_graphs_have_no_isolated_nodes():
+    for index in range(20):
+        row = dict(zip(COLUMNS, graph_statistics(index, seed=0, avoid_crossings=False)))
+        assert row["degree_0"] == 0
+        assert row["nodes"] == 0 or row["min_degree"] >= 1
@@ -0,0 +1,92 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from crossings import SegmentIndex, count_crossings, orientation, segments_cross
+from graph_logic import GraphLogic
+
+
+def random_segments(count, size=1000):
+    return [((random.randint(0, size), random.randint(0, size)), (random.randint(0, size), random.randint(0, size)))
+            for _ in range(count)]
+
+
+def test_orientation():
+    assert orientation((0, 0), (1, 0), (0, 1)) == 1
+    assert orientation((0, 0), (1, 0), (0, -1)) == -1
+    assert orientation((0, 0), (1, 1), (2, 2)) == 0
+
+
+def test_only_proper_crossings_count():
+    assert segments_cross((0, 0), (2, 2), (0, 2), (2, 0))
+    assert not segments_cross((0, 0), (2, 2), (2, 2), (4, 0))
+    assert not segments_cross((0, 0), (2, 0), (1, 0), (3, 0))
+    assert not segments_cross((0, 0), (2, 2), (1, 1), (3, 0))
+    assert not segments_cross((0, 0), (1, 0), (0, 1), (1, 1))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_matches_brute_force(seed):
+    random.seed(seed)
+    segments = random_segments(150, size=random.choice((20, 1000)))
+    expected = sum(segments_cross(a, b, c, d) for (a, b), (c, d) in combinations(segments, 2))
+    assert count_crossings(segments) == expected
+
+
+def test_count_of_vertical_and_shared_end_segments():
+    segments = [((5, 0), (5, 10)), ((0, 5), (10, 5)), ((5, 10), (10, 0)), ((0, 0), (5, 10))]
+    assert count_crossings(segments) == 3
+    assert count_crossings([]) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_index_matches_brute_force(seed):
+    random.seed(seed)
+    index = SegmentIndex(cell_size=100)
+    registered = dict(enumerate(random_segments(60)))
+    for key, (a, b) in registered.items():
+        index.add(key, a, b)
+    for key in random.sample(sorted(registered), 20):
+        index.remove(key)
+        del registered[key]
+
+    for a, b in random_segments(200):
+        expected = any(segments_cross(a, b, c, d) for (c, d) in registered.values())
+        assert index.crosses(a, b) == expected
+
+
+@pytest.mark.parametrize("cell_size", [None, 1, 50, 5000])
+def test_count_does_not_depend_on_the_cell_size(cell_size):
+    random.seed(cell_size)
+    segments = random_segments(120) + [((0, 500), (1000, 500)), ((500, 0), (500, 1000))]
+    expected = sum(segments_cross(a, b, c, d) for (a, b), (c, d) in combinations(segments, 2))
+    assert count_crossings(segments, cell_size=cell_size) == expected
+
+
+def test_index_counts_its_segments_once_per_pair():
+    index = SegmentIndex(cell_size=10)
+    index.add("long", (0, 0), (100, 100))
+    index.add("across", (0, 100), (100, 0))
+    index.add("apart", (200, 200), (300, 200))
+    assert index.count_crossings() == 1
+
+
+@pytest.mark.parametrize("avoid", [False, True])
+def test_generated_graphs_follow_the_crossing_mode(avoid):
+    graph_logic = GraphLogic(width=800, height=800)
+    graph_logic.avoid_crossings_value = avoid
+    calls = []
+    linking = graph_logic.random_linking_process
+
+    def spy(nodes, avoid_crossings):
+        calls.append(avoid_crossings)
+        linking(nodes, avoid_crossings)
+
+    graph_logic.random_linking_process = spy
+
+    random.seed(3)
+    graph_logic.generate_graph()
+    assert calls == [avoid]
+    if avoid:
+        assert graph_logic.crossing_count() == 0
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from geometry import PositionStore, manhattan_distance_to_segment
+
+
+def test_distance_to_segment():
+    assert manhattan_distance_to_segment(5, 3, 0, 0, 10, 0) == 3
+    assert manhattan_distance_to_segment(-2, 1, 0, 0, 10, 0) == 3
+    assert manhattan_distance_to_segment(0, 0, 0, 0, 0, 0) == 0
+
+
+def test_store_behaves_like_a_mapping():
+    store = PositionStore(cell_size=10)
+    store[1] = (5, 5)
+    store[2] = (25, 5)
+    store[3] = (45, 45)
+    del store[1]
+    store[2] = (30, 30)
+
+    assert len(store) == 2 and 1 not in store
+    assert dict(store.items()) == {2: (30, 30), 3: (45, 45)}
+    assert store[3] == (45, 45)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_queries_match_a_linear_scan(seed):
+    random.seed(seed)
+    store = PositionStore(cell_size=50)
+    positions = {}
+    for node in range(200):
+        positions[node] = store[node] = (random.randint(-500, 500), random.randint(-500, 500))
+    for node in random.sample(range(200), 50):
+        del store[node]
+        del positions[node]
+
+    for _ in range(100):
+        x, y = random.randint(-500, 500), random.randint(-500, 500)
+        radius = random.randint(1, 120)
+        distances = {node: abs(px - x) + abs(py - y) for node, (px, py) in positions.items()}
+
+        nearest = store.nearest(x, y, radius)
+        in_radius = [distance for distance in distances.values() if distance <= radius]
+        if in_radius:
+            assert distances[nearest] == min(in_radius)
+        else:
+            assert nearest is None
+
+        assert store.any_closer_than(x, y, radius) == any(distance < radius for distance in distances.values())
+
+        end = (random.randint(-500, 500), random.randint(-500, 500))
+        expected = any(manhattan_distance_to_segment(px, py, x, y, *end) < radius for px, py in positions.values())
+        assert store.any_near_segment((x, y), end, radius) == expected
+
+
+def test_load_replaces_every_position():
+    store = PositionStore(cell_size=10)
+    store[9] = (1, 1)
+    store.load([1, 2], [10, 20], [30, 40])
+    assert dict(store.items()) == {1: (10, 30), 2: (20, 40)}
+    assert store.nearest(20, 40, 1) == 2
@@ -0,0 +1,187 @@
+import pytest
+
+from graph import DEFAULT_WEIGHT, EdgeOverlay, GraphNetX
+from graph_logic import GraphLogic
+
+POSITIONS = [(60, 60), (360, 60), (360, 260), (60, 300), (200, 200)]
+EDGES = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (4, 2)]
+
+
+def build(weighted):
+    graph_logic = GraphLogic(weighted=weighted)
+    graph_logic.add_circles(POSITIONS)
+    graph_logic.add_edges(EDGES)
+    return graph_logic
+
+
+def test_converted_edges_are_weighed_like_new_edges():
+    converted = build(weighted=False)
+    converted.set_graph_kind(weighted=True)
+    fresh = build(weighted=True)
+
+    for (u, v) in EDGES:
+        assert converted.graph.weight(u, v) == fresh.graph.weight(u, v) == converted._edge_length(u, v)
+    assert converted.shortest_path(0, 2) == fresh.shortest_path(0, 2)
+    assert converted.minimum_spanning_tree()[1] == fresh.minimum_spanning_tree()[1]
+
+
+@pytest.mark.parametrize("weigh, expected", [(None, DEFAULT_WEIGHT), (lambda u, v: u + v, 3.0)])
+def test_set_kind_weighs_edges_when_weights_are_enabled(weigh, expected):
+    graph = GraphNetX()
+    graph.add_nodes(range(3))
+    graph.add_edges([(1, 2)])
+    graph.set_kind(weighted=True, weigh=weigh)
+    assert graph.weight(1, 2) == expected
+
+
+def test_existing_weights_are_kept_and_parallel_edges_keep_the_lightest():
+    graph = GraphNetX(weighted=True, multigraph=True)
+    graph.add_nodes(range(2))
+    graph.add_edges([(0, 1, 5.0), (0, 1, 2.0)])
+    graph.set_kind(weighted=True, weigh=lambda u, v: 100.0)
+    assert graph.weight(0, 1) == 2.0
+    assert len(graph.get_edges()) == 1
+
+
+def test_new_nodes_are_placed_in_the_world_box():
+    graph_logic = GraphLogic()
+    graph_logic.set_world(-1000, -500, -400, 0)
+
+    for _ in range(20):
+        x, y = graph_logic.generate_position()
+        assert -960 <= x <= -440 and -460 <= y <= -40
+
+    graph_logic.add_circle((100, 100))
+    graph_logic.add_circle((-700, -250))
+    assert list(graph_logic.circles.values()) == [(-700, -250)]
+
+
+def test_world_box_follows_the_view_and_keeps_outside_nodes():
+    graph_logic = GraphLogic(width=2000, height=2000)
+    graph_logic.add_circle((1500, 1500))
+
+    graph_logic.set_world(0, 0, 600, 400)
+    assert (graph_logic.width_, graph_logic.height_) == (600, 400)
+    assert graph_logic.is_circle_too_close((1000, 1000))
+    assert graph_logic.circles[0] == (1500, 1500)
+
+
+def test_no_position_in_a_world_box_smaller_than_its_margins():
+    graph_logic = GraphLogic()
+    graph_logic.set_world(0, 0, 50, 50)
+    assert graph_logic.generate_position() is None
+
+
+def test_edges_to_unknown_nodes_are_ignored():
+    graph_logic = build(weighted=False)
+    assert graph_logic.add_edges([(0, 9), (9, 10), (1, 3)]) == [(1, 3)]
+    assert 9 not in graph_logic.graph.get_nodes()
+
+
+@pytest.mark.parametrize("kind", [(False, False, False), (True, False, False), (False, True, True), (True, True, True)])
+def test_bulk_edges_and_nodes_keep_edge_ids_consistent(kind):
+    graph = GraphNetX(*kind)
+    graph.add_nodes(range(4))
+    new_pairs = graph.add_edges([(0, 1, 2.0), (1, 0, 3.0), (0, 1, 4.0), (1, 2), (2, 2), (2, 3)])
+    assert new_pairs == [(0, 1), (1, 2), (2, 3)]
+    assert len(graph.graph.edges()) == sum(1 for _ in graph.iter_edges())
+
+    graph.remove_nodes([1, 2])
+    assert graph.get_nodes() == [0, 3]
+    assert list(graph.iter_edges()) == []
+    graph.add_edges([(0, 3, 5.0)])
+    assert [edge_id for (_, _, edge_id) in graph.iter_edges()] == [graph.edge_id(0, 3)]
+
+
+def path_graph(multigraph=False):
+    graph = GraphNetX(multigraph=multigraph)
+    graph.add_nodes(range(4))
+    graph.add_edges([(0, 1), (1, 2), (2, 3)])
+    return graph
+
+
+@pytest.mark.parametrize("multigraph", [False, True])
+def test_edge_ids_are_recycled(multigraph):
+    graph = path_graph(multigraph)
+    assert [graph.edge_id(u, u + 1) for u in range(3)] == [0, 1, 2]
+
+    graph.remove_edge(1, 2)
+    assert graph.edge_id(1, 2) is None
+    graph.add_edge(0, 3)
+    assert graph.edge_id(0, 3) == 1
+    graph.add_edge(0, 2)
+    assert graph.edge_id(0, 2) == 3
+
+
+@pytest.mark.parametrize("multigraph", [False, True])
+def test_removed_edges_are_unflagged(multigraph):
+    graph = path_graph(multigraph)
+    visited = graph.overlay("visited")
+    for u in range(3):
+        visited.add(graph.edge_id(u, u + 1))
+
+    graph.remove_edge(0, 1)
+    assert sorted(visited) == [1, 2]
+    graph.remove_nodes([3])
+    assert list(visited) == [1]
+
+    graph.add_edges([(0, 1), (0, 2)])
+    assert graph.edge_id(0, 2) not in visited
+    assert list(visited) == [graph.edge_id(1, 2)]
+
+
+def test_overlays_are_independent():
+    graph = path_graph()
+    visited, bridges = graph.overlay("visited"), graph.overlay("bridges")
+    assert graph.overlay("visited") is visited
+
+    visited.add(0)
+    bridges.add(2)
+    visited.clear()
+    assert list(visited) == []
+    assert list(bridges) == [2]
+
+
+def test_overlay_iteration_and_length():
+    overlay = EdgeOverlay()
+    for edge_id in (5, 2, 2, 9):
+        overlay.add(edge_id)
+    assert list(overlay) == [2, 5, 9]
+    assert len(overlay) == 3
+
+    overlay.discard(5)
+    overlay.discard(7)
+    assert list(overlay) == [2, 9]
+    assert len(overlay) == 2
+    assert None not in overlay and -1 not in overlay
+
+
+def test_add_circles_rejects_positions_too_close_or_out_of_bounds():
+    graph_logic = GraphLogic()
+    graph_logic.add_circle((100, 100))
+
+    new_ids = graph_logic.add_circles([(110, 100), (300, 100), (310, 110), (5, 5), (300, 300)])
+    assert new_ids == [None, 1, None, None, 2]
+    assert graph_logic.graph.get_nodes() == [0, 1, 2]
+    assert graph_logic.analysis.degree_stats()["nodes"] == 3
+
+
+def test_remove_circles_ignores_duplicates_and_missing_nodes():
+    graph_logic = build(weighted=False)
+    graph_logic.selected_circle = {0, 2}
+
+    graph_logic.remove_circles([0, 0, 7, 2])
+    assert sorted(graph_logic.circles.keys()) == [1, 3, 4]
+    assert graph_logic.graph.get_nodes() == [1, 3, 4]
+    assert graph_logic.graph.get_edges() == []
+    assert graph_logic.selected_circle == set()
+    assert graph_logic.analysis.component_count() == 3
+
+
+def test_remove_edges_ignores_missing_edges():
+    graph_logic = build(weighted=False)
+    graph_logic.remove_edges([(0, 1), (1, 3), (0, 7), (1, 0)])
+
+    assert not graph_logic.graph.has_edge(0, 1)
+    assert len(graph_logic.graph.get_edges()) == len(EDGES) - 1
+    assert graph_logic.analysis.degree_stats()["edges"] == len(EDGES) - 1
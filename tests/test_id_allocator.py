@@ -0,0 +1,48 @@
+from id_allocator import IdAllocator
+
+
+def test_ids_come_from_a_monotonic_counter():
+    allocator = IdAllocator()
+    assert [allocator.allocate() for _ in range(3)] == [0, 1, 2]
+    allocator.release(1)
+    assert allocator.allocate() == 3
+    assert list(allocator) == [0, 2, 3]
+
+
+def test_released_ids_are_reused_when_enabled():
+    allocator = IdAllocator(reuse_ids=True)
+    for _ in range(3):
+        allocator.allocate()
+    allocator.release(1)
+    assert allocator.allocate() == 1
+    assert allocator.allocate() == 3
+
+
+def test_reserve_removes_from_free_list_and_moves_counter():
+    allocator = IdAllocator(reuse_ids=True)
+    allocator.allocate()
+    allocator.release(0)
+    allocator.reserve(0)
+    allocator.reserve(7)
+    assert 0 in allocator and 7 in allocator
+    assert allocator.allocate() == 8
+
+
+def test_last_returns_most_recent_live_ids():
+    allocator = IdAllocator()
+    for _ in range(5):
+        allocator.allocate()
+    allocator.release(4)
+    assert allocator.last(2) == [2, 3]
+    assert allocator.last(10) == [0, 1, 2, 3]
+
+
+def test_restore_and_clear():
+    allocator = IdAllocator(reuse_ids=True)
+    allocator.restore([5, 2], 9)
+    assert list(allocator) == [5, 2] and len(allocator) == 2
+    assert allocator.allocate() == 9
+
+    allocator.clear()
+    assert len(allocator) == 0
+    assert allocator.allocate() == 0
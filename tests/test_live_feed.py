@@ -0,0 +1,145 @@
+import json
+import os
+
+import pytest
+
+from graph_logic import GraphLogic
+from live_feed import MAX_LINE_LENGTH, EventBatch, LiveFeed
+
+
+def test_last_operation_wins():
+    batch = EventBatch()
+    batch.push({"op": "add_node", "id": "a"})
+    batch.push({"op": "add_edge", "source": "b", "target": "a"})
+    batch.push({"op": "remove_edge", "source": "a", "target": "b"})
+    assert batch.edge_ops == {("a", "b"): "remove_edge"}
+
+    batch.push({"op": "remove_node", "id": "a"})
+    batch.push({"op": "add_node", "id": "a", "x": 10, "y": 20})
+    assert batch.node_ops == {"a": ("replace", (10, 20))}
+    assert batch.edge_ops == {}
+
+
+def test_directed_batch_keeps_both_directions():
+    batch = EventBatch(directed=True)
+    batch.push({"op": "add_edge", "source": 1, "target": 2, "weight": 3})
+    batch.push({"op": "add_edge", "source": 2, "target": 1})
+    assert batch.edge_ops == {(1, 2): "add_edge", (2, 1): "add_edge"}
+    assert batch.edge_weights == {(1, 2): 3.0}
+
+
+@pytest.mark.parametrize("event", [
+    {"op": "add_edge", "source": 1, "target": 2, "weight": -1},
+    {"op": "add_edge", "source": 1, "target": 2, "weight": "nan"},
+    {"op": "add_edge", "source": 1},
+    {"op": "add_node", "id": [1]},
+    {"op": "add_node", "id": 3, "x": float("inf"), "y": 0},
+    {"op": "add_node", "id": 3, "x": 0, "y": float("nan")},
+    {"op": "rename_node", "id": 1},
+    ["add_node"],
+])
+def test_invalid_events_leave_the_batch_untouched(event):
+    batch = EventBatch()
+    batch.push({"op": "add_edge", "source": 1, "target": 2, "weight": 5})
+    with pytest.raises((ValueError, KeyError, TypeError)):
+        batch.push(event)
+    assert batch.edge_ops == {(1, 2): "add_edge"}
+    assert batch.edge_weights == {(1, 2): 5.0}
+    assert batch.node_ops == {}
+
+
+def test_malformed_event_does_not_discard_its_list():
+    feed = LiveFeed(GraphLogic())
+    line = json.dumps([{"op": "add_node", "id": 1}, {"op": "bogus"}, {"op": "add_node", "id": 2},
+                       {"op": "add_node", "id": 3, "x": float("inf"), "y": 0}])
+    assert feed.push_line(line.encode()) == 2
+    assert feed.push_line(b"{not json") == 0
+    assert set(feed.batch.node_ops) == {1, 2}
+
+
+def test_flush_applies_the_batch_to_the_graph():
+    graph_logic = GraphLogic(weighted=True)
+    feed = LiveFeed(graph_logic)
+    for event in ({"op": "add_node", "id": "a", "x": 100, "y": 100},
+                  {"op": "add_node", "id": "b", "x": 300, "y": 100},
+                  {"op": "add_node", "id": "c"},
+                  {"op": "add_edge", "source": "a", "target": "b", "weight": 7},
+                  {"op": "add_edge", "source": "a", "target": "c"},
+                  {"op": "add_edge", "source": "a", "target": "missing"}):
+        feed.push(event)
+
+    assert feed.flush()
+    assert not feed.flush()
+    a, b, c = (feed.local_ids[node] for node in "abc")
+    assert graph_logic.circles[a] == (100, 100)
+    assert graph_logic.graph.weight(a, b) == 7.0
+    assert graph_logic.graph.has_edge(a, c)
+    assert graph_logic.analysis.component_count() == 1
+
+    feed.push({"op": "remove_node", "id": "a"})
+    feed.flush()
+    assert a not in graph_logic.circles
+    assert graph_logic.graph.get_edges() == []
+
+
+def test_nodes_removed_by_the_user_are_forgotten():
+    graph_logic = GraphLogic()
+    feed = LiveFeed(graph_logic)
+    feed.push({"op": "add_node", "id": "a", "x": 100, "y": 100})
+    feed.push({"op": "add_node", "id": "b", "x": 300, "y": 100})
+    feed.flush()
+
+    graph_logic.remove_circle(feed.local_ids["a"])
+    feed.push({"op": "add_edge", "source": "a", "target": "b"})
+    feed.flush()
+
+    assert "a" not in feed.local_ids
+    assert graph_logic.graph.get_nodes() == [feed.local_ids["b"]]
+    assert graph_logic.graph.get_edges() == []
+
+
+def test_clearing_the_graph_forgets_every_node():
+    graph_logic = GraphLogic()
+    feed = LiveFeed(graph_logic)
+    feed.push({"op": "add_node", "id": "a", "x": 100, "y": 100})
+    feed.flush()
+
+    graph_logic.clear_circles()
+    graph_logic.add_circle((200, 200))
+    feed.push({"op": "remove_node", "id": "a"})
+    feed.flush()
+
+    assert feed.local_ids == {}
+    assert list(graph_logic.circles.values()) == [(200, 200)]
+
+
+def test_server_disconnects_a_client_without_newlines():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QDeadlineTimer
+    from PyQt6.QtNetwork import QLocalSocket
+    from PyQt6.QtWidgets import QApplication
+    from graph_UI import InteractionArea
+    from live_feed import LiveFeedServer
+
+    app = QApplication.instance() or QApplication([])
+    area = InteractionArea()
+    server = LiveFeedServer(area, f"graph-feed-test-{os.getpid()}")
+
+    def wait(condition):
+        deadline = QDeadlineTimer(5000)
+        while not condition() and not deadline.hasExpired():
+            app.processEvents()
+        return condition()
+
+    client = QLocalSocket()
+    client.connectToServer(server.server.fullServerName())
+    assert client.waitForConnected(5000)
+    client.write(b'{"op": "add_node", "id": 1, "x": 100, "y": 100}\n')
+    assert wait(lambda: len(area.graph.circles) == 1)
+
+    chunk = b" " * (1 << 16)
+    for _ in range(MAX_LINE_LENGTH // len(chunk) + 2):
+        client.write(chunk)
+    client.flush()
+    assert wait(lambda: client.state() == QLocalSocket.LocalSocketState.UnconnectedState)
+    assert wait(lambda: not server.buffers)
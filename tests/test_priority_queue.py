@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from priority_queue import IndexedHeap
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4, 8])
+def test_pops_in_priority_order_with_updates(arity):
+    random.seed(arity)
+    heap = IndexedHeap(arity)
+    reference = {}
+    for _ in range(3000):
+        if random.random() < 0.6 or not heap:
+            item, priority = random.randrange(200), random.random()
+            heap.push(item, priority)
+            reference[item] = priority
+        else:
+            item, priority = heap.pop()
+            assert priority == min(reference.values())
+            assert reference.pop(item) == priority
+        assert len(heap) == len(reference)
+        assert all(heap.priority(item) == priority for item, priority in reference.items())
+
+
+def test_push_updates_in_place_in_both_directions():
+    heap = IndexedHeap()
+    for item, priority in (("a", 5), ("b", 3), ("c", 4)):
+        heap.push(item, priority)
+    heap.push("a", 1)
+    assert heap.peek() == ("a", 1)
+    heap.push("a", 10)
+    assert len(heap) == 3
+    assert [heap.pop()[0] for _ in range(3)] == ["b", "c", "a"]
+
+
+def test_tuple_priorities_and_membership():
+    heap = IndexedHeap()
+    heap.push(1, (0, -3))
+    heap.push(2, (-1, 0))
+    assert 1 in heap and 3 not in heap
+    assert heap.pop() == (2, (-1, 0))
+
+
+def test_empty_heap_raises():
+    heap = IndexedHeap()
+    with pytest.raises(IndexError):
+        heap.pop()
+    with pytest.raises(IndexError):
+        heap.peek()
@@ -0,0 +1,91 @@
+import pytest
+
+from graph import GraphNetX
+from graph_logic import GraphLogic
+from result_cache import ResultCache, freeze
+
+
+def test_miss_then_hit():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 42
+
+    assert cache.get_or_compute("a", compute) == 42
+    assert cache.get_or_compute("a", compute) == 42
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResultCache(max_size=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_clear():
+    cache = ResultCache()
+    cache.get_or_compute("a", lambda: 1)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_freeze():
+    steps, parents, marked, weight = freeze(([(0, None), (1, 0)], {1: 0}, {0, 1}, 2.5))
+
+    assert steps == ((0, None), (1, 0))
+    assert parents == {1: 0}
+    assert marked == frozenset({0, 1})
+    assert weight == 2.5
+    with pytest.raises(TypeError):
+        parents[2] = 1
+
+
+def test_cached_results_are_read_only():
+    graph = GraphNetX()
+    graph.add_nodes(range(3))
+    graph.add_edges([(0, 1, 1.0), (1, 2, 1.0)])
+
+    order, parents = graph.bfs(0)
+    with pytest.raises(AttributeError):
+        order.append(5)
+    with pytest.raises(TypeError):
+        parents[0] = 2
+
+    distances, _ = graph.dijkstra(0)
+    with pytest.raises(TypeError):
+        distances[2] = 0.0
+    assert graph.dijkstra(0)[0] == {0: 0.0, 1: 1.0, 2: 2.0}
+
+
+def test_mutation_invalidates_results():
+    graph = GraphNetX()
+    graph.add_nodes(range(3))
+    graph.add_edges([(0, 1, 1.0)])
+    assert list(graph.bfs(0)[0]) == [0, 1]
+
+    graph.add_edges([(1, 2, 1.0)])
+    assert list(graph.bfs(0)[0]) == [0, 1, 2]
+    assert graph.results.misses == 2
+
+
+def test_coloration_does_not_alter_the_cache():
+    graph_logic = GraphLogic()
+    graph_logic.graph.add_nodes(range(3))
+    graph_logic.graph.add_edges([(0, 1, 1.0), (1, 2, 1.0)])
+
+    graph_logic.coloration()
+    colors = dict(graph_logic.node_colors)
+    graph_logic.clear_visualization()
+    graph_logic.coloration()
+
+    assert graph_logic.node_colors == colors
+    assert graph_logic.graph.results.hits == 1
@@ -0,0 +1,173 @@
+import os
+from array import array
+
+import pytest
+
+from graph_logic import GraphLogic
+from snapshot import HEADER, SECTION, load_session, read_snapshot, save_session, write_snapshot
+
+
+def sample_graph():
+    graph_logic = GraphLogic(width=1000, height=1000, directed=True, weighted=True, multigraph=True)
+    graph_logic.add_circles([(60 + 110 * (node % 5), 60 + 110 * (node // 5)) for node in range(25)])
+    graph_logic.add_edges([(0, 1), (0, 1), (1, 2, 4.5), (3, 2), (5, 6)])
+    graph_logic.selected_circle = set(range(7, 24))
+    graph_logic.full_link_selected_nodes()
+    graph_logic.selected_circle = {0, 2}
+    graph_logic.link_node_value = True
+
+    steps, _, _ = graph_logic.find_articulation_points()
+    graph_logic.steps = steps
+    graph_logic.current_index = 3
+    for step in steps[:3]:
+        graph_logic.visit_step(*step)
+    return graph_logic
+
+
+def state(graph_logic):
+    graph = graph_logic.graph
+    return {
+        "kind": (graph.directed, graph.weighted, graph.multigraph),
+        "circles": dict(graph_logic.circles.items()),
+        "edges": sorted((u, v, graph.edge_weight(edge_id)) for (u, v, edge_id) in graph.iter_edges()),
+        "cliques": sorted(sorted(members) for members in graph.cliques.values()),
+        "selected": graph_logic.selected_circle,
+        "steps": list(graph_logic.steps),
+        "index": graph_logic.current_index,
+        "visited": graph_logic.visited_nodes,
+        "marked": graph_logic.marked_nodes,
+        "bridges": sorted(graph_logic.bridge_edges),
+        "link": graph_logic.link_node_value,
+        "components": graph_logic.analysis.component_count(),
+    }
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "session")
+    save_session(path, sample_graph())
+    return path
+
+
+def test_round_trip(snapshot_path):
+    restored = GraphLogic()
+    load_session(snapshot_path, restored)
+    assert state(restored) == state(sample_graph())
+    assert not os.path.exists(snapshot_path + ".tmp")
+
+
+def test_arrays_round_trip(tmp_path):
+    path = str(tmp_path / "arrays")
+    sections = {"AAAA": array("q", [1, -2, 3]), "BBBB": array("d", [0.5]), "CCCC": array("i")}
+    write_snapshot(path, sections)
+    assert read_snapshot(path) == sections
+
+
+@pytest.mark.parametrize("size", [0, 2, 6, HEADER.size - 1])
+def test_files_shorter_than_the_header(tmp_path, size):
+    path = str(tmp_path / "short")
+    with open(path, "wb") as file:
+        file.write(b"GVSN\x03\x00"[:size])
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+
+
+def test_every_truncation_is_rejected_and_leaves_the_graph_untouched(snapshot_path, tmp_path):
+    with open(snapshot_path, "rb") as file:
+        data = file.read()
+
+    graph_logic = sample_graph()
+    expected = state(graph_logic)
+    path = str(tmp_path / "truncated")
+    for size in range(len(data)):
+        with open(path, "wb") as file:
+            file.write(data[:size])
+        with pytest.raises((ValueError, KeyError)):
+            load_session(path, graph_logic)
+    assert state(graph_logic) == expected
+
+
+def test_bad_magic_and_newer_version(snapshot_path):
+    with open(snapshot_path, "r+b") as file:
+        file.write(b"XXXX")
+    with pytest.raises(ValueError, match="not a graph snapshot"):
+        read_snapshot(snapshot_path)
+
+    with open(snapshot_path, "r+b") as file:
+        file.write(HEADER.pack(b"GVSN", 99, 0, 0))
+    with pytest.raises(ValueError, match="version"):
+        read_snapshot(snapshot_path)
+
+
+def test_section_out_of_bounds(snapshot_path):
+    with open(snapshot_path, "r+b") as file:
+        file.seek(HEADER.size)
+        name, typecode, length, offset = SECTION.unpack(file.read(SECTION.size))
+        file.seek(HEADER.size)
+        file.write(SECTION.pack(name, typecode, length + 10 ** 6, offset))
+    with pytest.raises(ValueError, match="out of bounds"):
+        read_snapshot(snapshot_path)
+
+
+def corrupted(tmp_path, snapshot_path, name, index, value):
+    sections = {name: array(values.format, values) for name, values in read_snapshot(snapshot_path).items()}
+    sections[name][index] = value
+    path = str(tmp_path / "corrupt")
+    write_snapshot(path, sections)
+    return path
+
+
+def test_sections_are_views_of_the_mapped_file(snapshot_path):
+    sections = read_snapshot(snapshot_path)
+    assert all(isinstance(values, memoryview) and values.readonly for values in sections.values())
+    assert sections["XPOS"].format == "i"
+
+
+def test_unknown_node_references_are_rejected(tmp_path, snapshot_path):
+    path = corrupted(tmp_path, snapshot_path, "EDGV", 0, 10 ** 6)
+    with pytest.raises(ValueError, match="unknown nodes"):
+        load_session(path, GraphLogic())
+
+
+@pytest.mark.parametrize("weight", [-1.0, float("inf"), float("nan")])
+def test_invalid_weights_leave_the_graph_untouched(tmp_path, snapshot_path, weight):
+    path = corrupted(tmp_path, snapshot_path, "WGHT", 0, weight)
+    graph_logic = sample_graph()
+    expected = state(graph_logic)
+    with pytest.raises(ValueError, match="WGHT"):
+        load_session(path, graph_logic)
+    assert state(graph_logic) == expected
+
+
+def test_other_versions_and_missing_sections_are_rejected(tmp_path, snapshot_path):
+    with open(snapshot_path, "r+b") as file:
+        file.seek(4)
+        file.write(HEADER.pack(b"GVSN", 2, 0, 0)[4:6])
+    with pytest.raises(ValueError, match="version"):
+        read_snapshot(snapshot_path)
+
+    path = str(tmp_path / "partial")
+    write_snapshot(path, {"META": array("q", [0] * 7), "NODE": array("q")})
+    with pytest.raises(KeyError):
+        load_session(path, GraphLogic())
+
+
+def test_interrupted_save_keeps_the_previous_snapshot(snapshot_path):
+    with open(snapshot_path, "rb") as file:
+        previous = file.read()
+
+    class Broken:
+        typecode = "q"
+        itemsize = 8
+
+        def __len__(self):
+            return 1
+
+        def tofile(self, file):
+            raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        write_snapshot(snapshot_path, {"META": array("q", [0]), "NODE": Broken()})
+    with open(snapshot_path, "rb") as file:
+        assert file.read() == previous
+    assert not os.path.exists(snapshot_path + ".tmp")
@@ -0,0 +1,41 @@
+from union_find import UnionFind
+
+
+def test_elements_start_as_singletons():
+    forest = UnionFind([1, 2, 3])
+    assert all(forest.find(element) == element for element in (1, 2, 3))
+    assert not forest.connected(1, 2)
+
+
+def test_union_merges_sets_and_reports_redundant_unions():
+    forest = UnionFind(range(4))
+    assert forest.union(0, 1) is not None
+    assert forest.union(2, 3) is not None
+    assert forest.union(1, 0) is None
+
+    root = forest.union(0, 3)
+    assert root is not None
+    assert forest.size[root] == 4
+    assert all(forest.find(element) == root for element in range(4))
+
+
+def test_add_is_idempotent():
+    forest = UnionFind()
+    forest.add("a")
+    forest.add("b")
+    forest.union("a", "b")
+    forest.add("a")
+    assert forest.connected("a", "b")
+    assert "a" in forest and "c" not in forest
+
+
+def test_reset_and_discard_rebuild_a_set():
+    forest = UnionFind(range(3))
+    forest.union(0, 1)
+    forest.union(1, 2)
+
+    forest.discard(2)
+    forest.reset(0)
+    forest.reset(1)
+    assert 2 not in forest
+    assert not forest.connected(0, 1)